@@ -5,11 +5,11 @@
  * This file contains the implementation of the Processor class, which is responsible for managing message processing within the application. It initializes Extractors and RabbitMQConsumer, starts them, and provides a mechanism for graceful shutdown.
  *
  * The main functionalities of this file include:
- * - Initializing Extractors and RabbitMQConsumer for message processing.
- * - Starting Extractors and RabbitMQConsumer threads.
- * - Entering a main processing loop until a shutdown event occurs.
+ * - Initializing Extractors, DatabaseWriter and RabbitMQConsumer for message processing.
+ * - Starting DatabaseWriter, Extractors and RabbitMQConsumer threads.
+ * - Blocking the main thread until a shutdown event occurs.
  * - Handling graceful shutdown upon user interruption (CTRL+C).
- * - Joining Extractors threads upon shutdown.
+ * - Joining the Extractor and then the DatabaseWriter upon shutdown, so queued results are stored before exiting.
  *
  * @version 1.0
  * @date 2024-03-22
@@ -18,14 +18,17 @@
  *
 """
 
-import queue
+import logging
 import threading
-import time
 
+from src.database_writer import DatabaseWriter
 from src.extractor import Extractor
-from src.logging.logger import Logger
+from src.logging.logger import APP_NAME, Logger
 from src.rabbitmq_consumer import RabbitMQConsumer
 from src.utils.arguments import Arguments
+from src.utils.spsc_queue import SPSCQueue
+
+logger = logging.getLogger(APP_NAME)
 
 
 class Processor:
@@ -36,29 +39,33 @@ class Processor:
 
     Attributes:
         shutdown_event (threading.Event): A threading event to signal shutdown.
-        message_queue (queue.Queue): A queue to store incoming messages.
+        message_queue (SPSCQueue): A single-producer single-consumer queue to store incoming messages.
+        write_queue (SPSCQueue): A single-producer single-consumer queue of evaluated results waiting to be stored.
         extractor (Extractor): A Extractor instance for processing messages.
+        database_writer (DatabaseWriter): A DatabaseWriter instance for storing evaluated results.
         consumer (RabbitMQConsumer): A RabbitMQConsumer instance for consuming messages.
-        logger (Logger): A logger instance for logging events.
     """
 
     def __init__(self) -> None:
         """
         Initialize the Processor class.
 
-        Initializes Extractors, RabbitMQConsumer, Logger, and other attributes.
+        Initializes Extractors, DatabaseWriter, RabbitMQConsumer, Logger, and other attributes.
         """
-        self.logger: Logger = Logger().get_logger()
-        args: Arguments = Arguments(self.logger).parse_args()
+        Logger()  # Configures the handlers of the shared application logger
+        args: Arguments = Arguments(logger).parse_args()
         self.shutdown_event: threading.Event = threading.Event()
-        self.message_queue: queue.Queue = queue.Queue(args.queue_size)
+        self.message_queue: SPSCQueue = SPSCQueue(args.queue_size)
+        self.write_queue: SPSCQueue = SPSCQueue(64)
         self.extractor: Extractor = Extractor(
             self.message_queue,
             self.shutdown_event,
-            args.database,
-            args.dbname,
+            self.write_queue,
             args.processes,
         )
+        self.database_writer: DatabaseWriter = DatabaseWriter(
+            self.write_queue, args.database, args.dbname
+        )
         self.consumer: RabbitMQConsumer = RabbitMQConsumer(
             args.rabbitmq, args.queue, self.message_queue, self.shutdown_event
         )
@@ -67,20 +74,24 @@ class Processor:
         """
         Start the processing loop.
 
-        Starts Extractor and RabbitMQConsumer, and enters the main processing loop.
+        Starts DatabaseWriter, Extractor and RabbitMQConsumer, blocks until the shutdown event is set,
+        and then waits for the Extractor and the DatabaseWriter to drain their queues and exit.
         """
+        self.database_writer.start()
         self.extractor.start()
         self.consumer.start()
 
-        self.logger.info("Application is running. Press CTRL+C to exit.")
+        logger.info("Application is running. Press CTRL+C to exit.")
         try:
-            while not self.shutdown_event.is_set():
-                time.sleep(10)
+            self.shutdown_event.wait()
         except KeyboardInterrupt:
-            self.logger.info("Interrupted by user, initiating shutdown...")
+            logger.info("Interrupted by user, initiating shutdown...")
             self.shutdown_event.set()
 
-        self.logger.info("Processor has exited.")
+        # The Extractor finishes its last batch before the DatabaseWriter stores it and closes the connection
+        self.extractor.join()
+        self.database_writer.join()
+        logger.info("Processor has exited.")
 
 
 if __name__ == "__main__":
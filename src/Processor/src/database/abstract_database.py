@@ -6,7 +6,8 @@
  *
  * The main functionalities of this file include:
  * - Defining an abstract base class (ABC) for interacting with a database.
- * - Declaring abstract methods for connecting to a database and inserting data.
+ * - Declaring abstract methods for connecting to a database, inserting data and closing the connection.
+ * - Connecting and closing the connection around a with block.
  *
  * @version 1.0
  * @date 2024-03-22
@@ -26,7 +27,8 @@ class AbstractDatabase(ABC):
     """
     @brief Abstract base class for interacting with a database.
 
-    This class defines abstract methods for connecting to a database and inserting data into it.
+    This class defines abstract methods for connecting to a database, inserting data into it and closing the connection.
+    It can be used as a context manager that connects on entry and closes the connection on exit.
 
     Attributes:
         None
@@ -41,6 +43,30 @@ class AbstractDatabase(ABC):
         """
         pass
 
+    def __enter__(self) -> "AbstractDatabase":
+        """
+        @brief Connect to the database when entering a with block.
+
+        @return The connected database instance.
+        """
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """
+        @brief Close the connection when leaving a with block, also when it is left by an exception.
+        """
+        self.close()
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        @brief Close the connection to the database.
+
+        This method should be implemented by concrete subclasses to release the connection to the database.
+        """
+        pass
+
     @abstractmethod
     def insert_dataframe(self, df: DataFrame) -> None:
         """
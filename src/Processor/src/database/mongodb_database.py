@@ -15,18 +15,118 @@
  *
  """
 
+import importlib.util
+import random
+import threading
 import time
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from datetime import datetime
-from typing import Union
+from itertools import chain, islice, repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
+import bson
 import pandas as pd
-from pymongo import MongoClient, errors
+import pymongo
+from pymongo import MongoClient, WriteConcern, errors
 from pymongo.collection import Collection
 from pymongo.database import Database
 
 from ..logging.logger import Logger
 from .abstract_database import AbstractDatabase
 
+# Wire compressors offered to the server in order of preference, zlib needs no extra package
+COMPRESSORS = ",".join(
+    [
+        name
+        for name, module in (("zstd", "zstandard"), ("snappy", "snappy"))
+        if importlib.util.find_spec(module) is not None
+    ]
+    + ["zlib"]
+)
+
+
+EVALUATOR_COLUMNS = frozenset(("domain_name", "predict_prob", "binary_pred"))
+"""Columns of the DataFrames returned by the evaluators"""
+
+
+def _column(data: pd.DataFrame, name: str, default: Any) -> Iterable[Any]:
+    """Returns a DataFrame column as Python objects, or the default repeated for every row if the column is missing."""
+    if name in data.columns:
+        return data[name].tolist()
+    return repeat(default, len(data))
+
+
+def _dataframe_documents(data: pd.DataFrame) -> Iterator[dict]:
+    """
+    Yields ResultEntity documents for the rows of a DataFrame.
+
+    Every column is converted to Python objects at once and the documents are zipped together
+    from the columns, so no intermediate per-row dictionary is built and looked up.
+    """
+    now = datetime.now()
+
+    # Evaluator output carries only the three evaluated columns, the others are constants
+    if EVALUATOR_COLUMNS == set(data.columns):
+        return (
+            {
+                "Detected": now,
+                "DidBlacklistHit": False,
+                "DangerousProbabilityValue": probability,
+                "DangerousBoolValue": prediction,
+                "DomainName": domain_name,
+            }
+            for domain_name, probability, prediction in zip(
+                data["domain_name"].tolist(),
+                data["predict_prob"].tolist(),
+                data["binary_pred"].tolist(),
+            )
+        )
+
+    # Rows without a detection time share one timestamp taken for the whole DataFrame
+    detected = _column(data, "Detected", now)
+    return (
+        {
+            "Detected": detected_at,
+            "DidBlacklistHit": blacklist_hit,
+            "DangerousProbabilityValue": probability,
+            "DangerousBoolValue": prediction,
+            "DomainName": domain_name,
+        }
+        for detected_at, blacklist_hit, probability, prediction, domain_name in zip(
+            detected,
+            _column(data, "DidBlacklistHit", False),
+            _column(data, "predict_prob", 0),
+            _column(data, "binary_pred", False),
+            data["domain_name"].tolist(),
+        )
+    )
+
+
+def _dict_documents(data: dict) -> List[dict]:
+    """Returns the ResultEntity document for a single dictionary."""
+    return [
+        {
+            "Detected": data["Detected"] if "Detected" in data else datetime.now(),
+            "DidBlacklistHit": data.get("DidBlacklistHit", False),
+            "DangerousProbabilityValue": data.get("predict_prob", 0),
+            "DangerousBoolValue": data.get("binary_pred", False),
+            "DomainName": data["domain_name"],
+        }
+    ]
+
+
+# ResultEntity document converters looked up by the exact type of the inserted data
+_DISPATCH: Dict[type, Callable[[Any], Iterable[dict]]] = {
+    pd.DataFrame: _dataframe_documents,
+    dict: _dict_documents,
+}
+
 
 class MongoDbDatabase(AbstractDatabase):
     """
@@ -40,13 +140,27 @@ class MongoDbDatabase(AbstractDatabase):
         db_name (str): The name of the database.
         collection_name (str): The name of the collection within the database.
         max_retries (int): The maximum number of connection retry attempts.
-        delay (int): The delay (in seconds) between connection retry attempts.
+        delay (int): The base delay (in seconds) of the backoff between connection retry attempts.
+        concurrency (int): The maximum number of insert_many calls in flight at once.
         client (MongoClient): The MongoDB client instance.
         db (Database): The MongoDB database instance.
         collection (Collection): The MongoDB collection instance.
         logger: The logger instance for logging messages.
     """
 
+    # One MongoClient (and so one connection pool and topology monitor) per URI, shared by all instances
+    _clients: Dict[str, MongoClient] = {}
+    _clients_lock: threading.Lock = threading.Lock()
+
+    # Upper bound (in seconds) of the backoff between connection attempts
+    MAX_RETRY_DELAY: int = 30
+    # Server selection timeout (in seconds) of every attempt but the last one
+    PING_TIMEOUT: float = 0.5
+    # Bounds of the number of documents per insert_many call and of the encoded size of a batch
+    MIN_BATCH_SIZE: int = 20
+    MAX_BATCH_SIZE: int = 100
+    MAX_BATCH_BYTES: int = 15 * 1024 * 1024
+
     def __init__(
         self,
         logger: Logger,
@@ -55,6 +169,7 @@ class MongoDbDatabase(AbstractDatabase):
         collection_name: str = "Result",
         max_retries: int = 3,
         delay: int = 5,
+        concurrency: int = 32,
     ) -> None:
         """
         Initialize the MongoDbDatabase instance.
@@ -64,7 +179,8 @@ class MongoDbDatabase(AbstractDatabase):
             db_name (str): The name of the database.
             collection_name (str, optional): The name of the collection within the database. Defaults to Result.
             max_retries (int, optional): The maximum number of connection retry attempts. Defaults to 3.
-            delay (int, optional): The delay (in seconds) between connection retry attempts. Defaults to 5.
+            delay (int, optional): The base delay (in seconds) of the backoff between connection retry attempts. Defaults to 5.
+            concurrency (int, optional): The maximum number of insert_many calls in flight at once. Defaults to 32.
             logger: The logger instance for logging operation messages.
         """
         self.logger: Logger = logger
@@ -73,36 +189,60 @@ class MongoDbDatabase(AbstractDatabase):
         self.collection_name: str = collection_name
         self.max_retries: int = max_retries
         self.delay: int = delay
+        self.concurrency: int = concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.client: MongoClient = None
         self.db: Database = None
         self.collection: Collection = None
 
-    def __del__(self) -> None:
-        """
-        Destructor method to ensure that the MongoDB connection is properly closed when the object is destroyed.
-        """
-        self.close()
-
     def connect(self) -> None:
         """
         Connect to the MongoDB server.
 
+        The MongoClient is shared with every other instance connected to the same URI,
+        only the initial ping is retried. Attempts before the last one use a short timeout and
+        are spaced by an exponential backoff with jitter, so short outages recover quickly
+        and long ones are not hammered.
+
         Raises:
             Exception: If the maximum number of connection retry attempts is reached.
+            errors.OperationFailure: If the server rejects the ping, e.g. on failed authentication,
+                which is not retried.
         """
+        with self._clients_lock:
+            self.client = self._clients.get(self.uri)
+            if self.client is None:
+                self.client = self._clients[self.uri] = MongoClient(
+                    self.uri,
+                    serverSelectionTimeoutMS=5000,
+                    maxPoolSize=self.concurrency * 2,
+                    minPoolSize=self.concurrency,
+                    compressors=COMPRESSORS,
+                    zlibCompressionLevel=1,
+                    retryWrites=False,
+                )
+        self.db = self.client[self.db_name]
+        self.collection = self.db[self.collection_name]
+
         retries = 0
         while retries < self.max_retries:
             try:
-                self.client = MongoClient(self.uri, serverSelectionTimeoutMS=5000)
-                self.db = self.client[self.db_name]
-                self.collection = self.db[self.collection_name]
-                self.client.admin.command("ismaster")
+                if retries < self.max_retries - 1:
+                    with pymongo.timeout(self.PING_TIMEOUT):
+                        self.client.admin.command("ismaster")
+                else:
+                    self.client.admin.command("ismaster")
                 self.logger.info("MongoDB connected successfully")
                 break
-            except errors.ServerSelectionTimeoutError as err:
-                self.logger.error(f"Connection attempt {retries + 1} failed: {err}")
-                time.sleep(self.delay)
+            # Any connection level failure is transient and retried, OperationFailure is not caught
+            except errors.ConnectionFailure as err:
+                self.logger.error("Connection attempt %d failed: %s", retries + 1, err)
                 retries += 1
+                if retries < self.max_retries:
+                    time.sleep(
+                        min(self.MAX_RETRY_DELAY, self.delay * 2 ** (retries - 1))
+                        * (0.5 + random.random())
+                    )
         if retries == self.max_retries:
             raise Exception("Max retries reached, could not connect to MongoDB")
 
@@ -111,37 +251,28 @@ class MongoDbDatabase(AbstractDatabase):
         if self.client is None or self.db is None or self.collection is None:
             raise RuntimeError("Database connection is not established.")
 
-    def _transform_data(self, data: Union[pd.DataFrame, dict]) -> list:
+    def _transform_data(self, data: Union[pd.DataFrame, dict]) -> Iterator[dict]:
         """
-        Transforms the input data into a list of documents matching the structure of ResultEntity.
+        Transforms the input data into documents matching the structure of ResultEntity.
+
+        DataFrame documents are assembled lazily from whole columns converted to Python objects at once,
+        so only the documents of the batch currently being inserted are alive at a time.
+        The converter is looked up by the exact type of the data, subclasses are not accepted.
 
         Args:
             data (Union[pd.DataFrame, dict]): The data to transform.
 
         Returns:
-            list: A list of dictionaries formatted according to the ResultEntity structure.
+            Iterator[dict]: Dictionaries formatted according to the ResultEntity structure.
+
+        Raises:
+            ValueError: If the data is neither a pandas DataFrame nor a dictionary.
         """
 
-        if isinstance(data, pd.DataFrame):
-            documents = data.to_dict("records")
-        elif isinstance(data, dict):
-            documents = [data]
-        else:
+        converter = _DISPATCH.get(type(data))
+        if converter is None:
             raise ValueError("Data must be a pandas DataFrame or a dictionary")
-
-        # Transform each document to match the Result structure
-        transformed_documents = []
-        for doc in documents:
-            transformed_doc = {
-                "Detected": doc.get("Detected", datetime.now()),
-                "DidBlacklistHit": doc.get("DidBlacklistHit", False),
-                "DangerousProbabilityValue": doc.get("predict_prob", 0),
-                "DangerousBoolValue": doc.get("binary_pred", False),
-                "DomainName": doc["domain_name"],
-            }
-            transformed_documents.append(transformed_doc)
-
-        return transformed_documents
+        return iter(converter(data))
 
     def handle_connection_failure(func):
         """Decorator to handle reconnection on connection failures."""
@@ -152,7 +283,8 @@ class MongoDbDatabase(AbstractDatabase):
                 return func(*args, **kwargs)
             except (errors.ConnectionFailure, errors.NetworkTimeout) as e:
                 self.logger.error(
-                    f"Operation failed due to connection issue: {e}, attempting to reconnect..."
+                    "Operation failed due to connection issue: %s, attempting to reconnect...",
+                    e,
                 )
                 self.connect()
                 return func(*args, **kwargs)
@@ -161,46 +293,125 @@ class MongoDbDatabase(AbstractDatabase):
 
     @handle_connection_failure
     def insert_dataframe(
-        self, data: Union[pd.DataFrame, dict], batch_size: int = 1000
+        self,
+        data: Union[pd.DataFrame, dict],
+        batch_size: int = 50,
+        fast_insert: bool = True,
     ) -> None:
         """
         Inserts transformed data into the MongoDB collection from a Pandas DataFrame or dictionary, in batches.
+        Batches are sent unordered, so the server does not serialize the inserts, and up to
+        `concurrency` batches are in flight at once on a thread pool.
         Wrapped with automatic reconnection.
+
+        Args:
+            data (Union[pd.DataFrame, dict]): The data to insert.
+            batch_size (int, optional): The maximum number of documents sent per insert_many call. Defaults to 50.
+                The effective size is capped at MAX_BATCH_SIZE and at what fits into MAX_BATCH_BYTES
+                judging by the encoded size of the first document.
+            fast_insert (bool, optional): Whether to use an unacknowledged write concern (w=0), so no
+                acknowledgement round-trip is awaited. Pass False when inserts must be acknowledged, only
+                acknowledged inserts bypass document validation. Defaults to True.
         """
         self._ensure_connected()
 
         transformed_documents = self._transform_data(data)
-        total_documents = len(transformed_documents)
+        first_document = next(transformed_documents, None)
+        if first_document is None:
+            self.logger.info("No data was inserted.")
+            return
+        transformed_documents = chain((first_document,), transformed_documents)
+        document_bytes = len(bson.encode(first_document))
+        batch_size = min(
+            batch_size,
+            max(self.MIN_BATCH_SIZE, self.MAX_BATCH_BYTES // document_bytes),
+            self.MAX_BATCH_SIZE,
+        )
         inserted_count = 0
+        if fast_insert:
+            # pymongo refuses bypass_document_validation with an unacknowledged write concern
+            collection = self.collection.with_options(write_concern=WriteConcern(w=0))
+            insert_options = {}
+        else:
+            collection = self.collection
+            insert_options = {"bypass_document_validation": True}
 
-        for start_idx in range(0, total_documents, batch_size):
-            end_idx = start_idx + batch_size
-            batch = transformed_documents[start_idx:end_idx]
-            try:
-                if batch:
-                    result = self.collection.insert_many(batch, ordered=False)
-                    inserted_count += len(result.inserted_ids)
-            except Exception as e:
-                self.logger.error(
-                    f"An error occurred while inserting batch {start_idx // batch_size + 1}: {e}"
-                )
+        executor = self._get_executor()
+        pending: Dict[Future, int] = {}
 
-        if inserted_count:
-            self.logger.info(f"Total inserted documents: {inserted_count}")
+        for batch_number, batch in enumerate(
+            iter(lambda: list(islice(transformed_documents, batch_size)), []), 1
+        ):
+            if len(pending) >= self.concurrency:
+                inserted_count += self._collect_inserts(pending, FIRST_COMPLETED)
+            future = executor.submit(
+                collection.insert_many,
+                batch,
+                ordered=False,
+                **insert_options,
+            )
+            pending[future] = batch_number
+        inserted_count += self._collect_inserts(pending, ALL_COMPLETED)
+
+        if inserted_count and fast_insert:
+            # Unacknowledged inserts only report the ids assigned by the client
+            self.logger.info("Submitted %d documents (unacknowledged)", inserted_count)
+        elif inserted_count:
+            self.logger.info("Total inserted documents: %d", inserted_count)
         else:
             self.logger.info("No data was inserted.")
 
-    def close(self) -> None:
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Returns the thread pool running the insert_many calls, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="MongoDbInsert"
+            )
+        return self._executor
+
+    def _collect_inserts(self, pending: Dict[Future, int], return_when: str) -> int:
         """
-        Explicitly closes the MongoDB client connection.
+        Waits for pending insert_many calls and removes the finished ones.
+
+        Args:
+            pending (Dict[Future, int]): The in-flight insert_many calls mapped to their batch numbers.
+            return_when (str): FIRST_COMPLETED to wait for at least one call, ALL_COMPLETED to wait for all.
+
+        Returns:
+            int: The number of documents inserted by the finished calls.
         """
-        if self.client:
+        inserted_count = 0
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            batch_number = pending.pop(future)
             try:
-                self.client.close()
-                self.logger.info("MongoDB connection closed successfully.")
+                inserted_count += len(future.result().inserted_ids)
             except Exception as e:
-                self.logger.error(f"Failed to close MongoDB connection: {e}")
-            finally:
-                self.client = None
-                self.db = None
-                self.collection = None
+                self.logger.error(
+                    "An error occurred while inserting batch %d: %s", batch_number, e
+                )
+        return inserted_count
+
+    def close(self) -> None:
+        """
+        Releases this instance's references to the shared MongoDB client and stops its insert threads.
+        The client itself stays open for other instances, see shutdown.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self.client = None
+        self.db = None
+        self.collection = None
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """
+        Explicitly closes every shared MongoDB client connection.
+        Must be called once no instance uses its client any more.
+        """
+        with cls._clients_lock:
+            clients = list(cls._clients.values())
+            cls._clients.clear()
+        for client in clients:
+            client.close()
@@ -0,0 +1,152 @@
+"""
+ * @file database_writer.py
+ * @brief Writes evaluated results to the database from a dedicated thread.
+ *
+ * This file contains the implementation of the DatabaseWriter class, which extends from threading.Thread. The DatabaseWriter drains a queue of evaluated DataFrames, merges them into large batches and inserts every batch with a single database call, so the extraction never waits on the database.
+ *
+ * The main functionalities of this file include:
+ * - Owning the database connection used for storing results.
+ * - Collecting queued DataFrames until a batch is full, the queue runs dry or the batch gets too old.
+ * - Inserting each collected batch into the database at once, while the next batch is being collected.
+ * - Draining the queue until the Extractor signals the end of its results with END_OF_STREAM, then closing the connection.
+ *
+ * @version 1.0
+ * @date 2024-03-22
+ * @author Matej Keznikl (matej.keznikl@gmail.com)
+ * @copyright Copyright (c) 2024
+ *
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Queue
+from typing import List, Optional
+
+import pandas as pd
+
+from .database.abstract_database import AbstractDatabase
+from .database.mongodb_database import MongoDbDatabase
+from .logging.logger import APP_NAME
+
+logger = logging.getLogger(APP_NAME)
+
+END_OF_STREAM = object()
+"""Put on the write queue by the Extractor after its last results, the DatabaseWriter exits once it takes it."""
+
+
+class DatabaseWriter(threading.Thread):
+    """Class for storing evaluated results in the database from a single thread.
+
+    Attributes:
+        write_queue (Queue): Queue of evaluated DataFrames waiting to be stored.
+        daemon (bool): Flag to set this thread as a daemon.
+        database (AbstractDatabase): Database instance for storing processed data.
+        batch_size (int): Number of rows after which a batch is inserted.
+        poll_timeout (float): Seconds to wait for further DataFrames before inserting a partial batch.
+        flush_interval (float): Maximum seconds between the first DataFrame of a batch and its insertion.
+        end_of_stream (bool): Whether END_OF_STREAM was taken from the write queue.
+    """
+
+    def __init__(
+        self,
+        write_queue,
+        database_uri,
+        database_name,
+        batch_size: int = 10000,
+        poll_timeout: float = 0.05,
+        flush_interval: float = 0.2,
+    ) -> None:
+        """Initialize the DatabaseWriter thread.
+
+        Args:
+            write_queue (Queue): Queue of evaluated DataFrames waiting to be stored.
+            database_uri (str): URI for the database connection.
+            database_name (str): Name of the database to connect to.
+            batch_size (int, optional): Number of rows after which a batch is inserted. Defaults to 10000.
+            poll_timeout (float, optional): Seconds to wait for further DataFrames before inserting
+                a partial batch. Defaults to 0.05.
+            flush_interval (float, optional): Maximum seconds between the first DataFrame of a batch
+                and its insertion. Defaults to 0.2.
+        """
+        super().__init__()
+        self.write_queue: Queue = write_queue
+        self.daemon: bool = True
+        self.database: AbstractDatabase = MongoDbDatabase(
+            logger, database_uri, database_name
+        )
+        self.batch_size: int = batch_size
+        self.poll_timeout: float = poll_timeout
+        self.flush_interval: float = flush_interval
+        self.end_of_stream: bool = False
+
+    def run(self) -> None:
+        """Main execution point for the thread, inserting batches until the end of the stream.
+
+        Each batch is inserted on a helper thread, so the next batch is collected from the queue
+        while the previous one is still being written. At most one insertion is in progress.
+        """
+        pending_insert: Optional[Future] = None
+
+        # The inserter is shut down first, so the last insertion finishes before the connection is closed
+        with self.database, ThreadPoolExecutor(max_workers=1) as inserter:
+            while not self.end_of_stream:
+                batch = self.collect_batch()
+                if not batch:
+                    continue
+                df = pd.concat(batch, ignore_index=True)
+                if pending_insert is not None:
+                    self.finish_insert(pending_insert)
+                pending_insert = inserter.submit(self.database.insert_dataframe, df)
+            if pending_insert is not None:
+                self.finish_insert(pending_insert)
+
+        MongoDbDatabase.shutdown()
+
+    @staticmethod
+    def finish_insert(pending_insert: Future) -> None:
+        """Wait for an insertion and log its error, so a failed batch does not stop the writer.
+
+        Args:
+            pending_insert (Future): The insertion submitted to the inserter.
+        """
+        try:
+            pending_insert.result()
+        except Exception as e:
+            logger.error("An error occurred while inserting a batch: %s", e)
+
+    def collect_batch(self) -> List[pd.DataFrame]:
+        """Collect queued DataFrames until the batch is full, no more arrive in time or the flush interval passes.
+
+        Collection also stops at END_OF_STREAM, which is not added to the batch.
+
+        Returns:
+            List[pd.DataFrame]: The collected DataFrames, empty if none arrived.
+        """
+        try:
+            df = self.write_queue.get(timeout=1)
+        except queue.Empty:
+            return []
+        if df is END_OF_STREAM:
+            self.end_of_stream = True
+            return []
+
+        batch: List[pd.DataFrame] = [df]
+        rows = len(df)
+        deadline = time.monotonic() + self.flush_interval
+        while rows < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                df = self.write_queue.get(timeout=min(self.poll_timeout, remaining))
+            except queue.Empty:
+                break
+            if df is END_OF_STREAM:
+                self.end_of_stream = True
+                break
+            batch.append(df)
+            rows += len(df)
+        return batch
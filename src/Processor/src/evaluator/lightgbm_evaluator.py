@@ -10,6 +10,8 @@
  * The main functionalities included:
  * - Evaluate method to output probabilities and binary predictions.
  * - Constructor for initializing the evaluator with a pre-trained model.
+ * - Building the column-major model input matrix with a single copy of the feature columns.
+ * - Optional compilation of the model to a native library with Treelite and TL2cgen, when they are installed.
  *
  * @version 1.0
  * @date 2024-03-22
@@ -18,13 +20,61 @@
  *
 """
 
+import logging
+import os
+import shutil
+import tempfile
+
 import numpy as np
 import pandas as pd
 from joblib import load
 
+try:
+    import tl2cgen
+    import treelite
+except ImportError:
+    tl2cgen = None
+    treelite = None
+
 from ..features.constants import DESIRED_FEATURE_ORDER
+from ..logging.logger import APP_NAME
 from .abstract_evaluator import Evaluator
 
+logger = logging.getLogger(APP_NAME)
+
+FEATURE_COLUMNS = [column for column in DESIRED_FEATURE_ORDER if column != "domain_name"]
+"""Model input columns in the order the model was trained with"""
+
+_FEATURE_POSITIONS = {column: position for position, column in enumerate(FEATURE_COLUMNS)}
+"""Position of each model input column in the feature matrix"""
+
+
+def _feature_matrix(data: pd.DataFrame) -> np.ndarray:
+    """
+    Copies the model input columns of a DataFrame into a column-major float64 matrix.
+
+    The matrix is allocated once in Fortran order, so every column is copied straight into
+    a contiguous slice without building an intermediate DataFrame of the selected columns.
+    Missing values are replaced with -1.
+
+    Args:
+        data (pd.DataFrame): A DataFrame containing all FEATURE_COLUMNS.
+
+    Returns:
+        np.ndarray: Matrix of shape (rows, len(FEATURE_COLUMNS)) in the order of FEATURE_COLUMNS.
+    """
+    missing_columns = _FEATURE_POSITIONS.keys() - set(data.columns)
+    if missing_columns:
+        raise KeyError(f"Missing feature columns: {sorted(missing_columns)}")
+
+    features = np.empty((len(data), len(FEATURE_COLUMNS)), dtype=np.float64, order="F")
+    for column, values in data.items():
+        position = _FEATURE_POSITIONS.get(column)
+        if position is not None:
+            features[:, position] = values.to_numpy()
+    np.copyto(features, -1, where=np.isnan(features))
+    return features
+
 
 class LightGBMEvaluator(Evaluator):
     """
@@ -45,6 +95,49 @@ class LightGBMEvaluator(Evaluator):
         """
         super().__init__(model_path)
         self.model = load(model_path)
+        # The underlying Booster returns the positive class probability directly, without the sklearn wrapper
+        self._booster = getattr(self.model, "booster_", self.model)
+        self._predictor = self._compile_model(model_path)
+
+    def _compile_model(self, model_path: str):
+        """
+        Compiles the model into a native shared library with Treelite and TL2cgen and loads it.
+
+        The library is built in a new directory created by mkdtemp under an unpredictable name and
+        accessible only to the user running the processor, so nobody else can place or replace a library
+        there before it is loaded, and concurrent processes never share it. The directory is removed once
+        the library is loaded, the loaded library stays mapped in the process.
+
+        Args:
+            model_path (str): Path to the LightGBM model file.
+
+        Returns:
+            tl2cgen.Predictor: The compiled predictor, or None if Treelite is not installed or the
+            compilation fails, in which case the LightGBM Booster is used.
+        """
+        if tl2cgen is None:
+            return None
+
+        library_directory = tempfile.mkdtemp(prefix="dga-detector-model-")
+        try:
+            library_path = os.path.join(
+                library_directory, f"{os.path.basename(model_path)}.so"
+            )
+            model = treelite.frontend.from_lightgbm(self._booster)
+            tl2cgen.export_lib(
+                model,
+                toolchain="gcc",
+                libpath=library_path,
+                params={"parallel_comp": 32},
+            )
+            return tl2cgen.Predictor(library_path, nthread=os.cpu_count())
+        except Exception as e:
+            logger.error(
+                "Compiling the model failed, the LightGBM Booster is used instead: %s", e
+            )
+            return None
+        finally:
+            shutil.rmtree(library_directory, ignore_errors=True)
 
     def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -63,30 +156,37 @@ class LightGBMEvaluator(Evaluator):
         if "domain_name" not in data.columns:
             raise ValueError("Input DataFrame must include a 'domain_name' column.")
 
-        if (
-            data.empty
-            or len(data.shape) != 2
-            or data.shape[0] == 0
-            or data.shape[1] == 0
-        ):
+        # A DataFrame is always two-dimensional and empty covers both zero rows and zero columns
+        if data.empty:
             return pd.DataFrame(columns=["domain_name", "predict_prob", "binary_pred"])
 
-        data = data[DESIRED_FEATURE_ORDER]
-
-        data.fillna(-1, inplace=True)
+        # A single copy of the features straight into the column-major model input matrix
+        features = _feature_matrix(data)
 
-        probabilities = self.model.predict_proba(data.drop(columns=["domain_name"]))
+        if self._predictor is not None:
+            positive_class_probabilities = (
+                self._predictor.predict(tl2cgen.DMatrix(features))
+                .reshape(-1)
+                .astype(np.float64, copy=False)
+            )
+        else:
+            positive_class_probabilities = self._booster.predict(
+                features, num_threads=os.cpu_count()
+            )
 
-        positive_class_probabilities = probabilities[:, 1] * 100
+        # Scaling and rounding reuse the prediction buffer, only the boolean mask is a new array
+        np.multiply(positive_class_probabilities, 100, out=positive_class_probabilities)
 
-        positive_class_probabilities = np.round(positive_class_probabilities, 4)
+        np.round(positive_class_probabilities, 4, out=positive_class_probabilities)
 
-        binary_predictions = positive_class_probabilities >= 50
+        binary_predictions = np.greater_equal(positive_class_probabilities, 50)
 
         return pd.DataFrame(
             {
-                "domain_name": data["domain_name"],
+                "domain_name": data["domain_name"].to_numpy(),
                 "predict_prob": positive_class_probabilities,
                 "binary_pred": binary_predictions,
-            }
+            },
+            index=data.index,
+            copy=False,
         )
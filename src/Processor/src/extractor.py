@@ -1,17 +1,18 @@
 """
  * @file extractor.py
- * @brief Manages the extraction of features from messages and interaction with databases in a multithreaded environment.
+ * @brief Manages the extraction of features from messages in a multithreaded environment.
  *
- * This file contains the implementation of the Extractor class, which extends from threading.Thread. The Extractor is designed to process messages from a message queue, perform feature extraction, evaluate results, and save them into a database. It uses various components such as feature extractors, evaluators, and database interfaces to handle different aspects of data processing efficiently.
+ * This file contains the implementation of the Extractor class, which extends from threading.Thread. The Extractor is designed to process messages from a message queue, perform feature extraction, evaluate results, and hand them over to the database writer. It uses various components such as feature extractors and evaluators to handle different aspects of data processing efficiently.
  *
  * The main functionalities of this file include:
  * - Processing messages continuously from a shared queue until a shutdown signal is received.
- * - Decoding messages, extracting relevant data, and converting them into a DataFrame.
+ * - Taking queued messages in batches and converting the domains of a whole batch into one DataFrame.
+ * - Evaluating one batch while the features of the next one are extracted by the worker pool.
  * - Utilizing a feature extractor to add computed features to the data.
  * - Evaluating the processed data using a predefined set of rules or models.
- * - Inserting results into the appropriate database collections based on processing outcomes.
+ * - Passing evaluated results to the database writer through a write queue.
  * - Handling exceptions and logging errors throughout the message processing flow.
- * - Providing mechanisms for a clean and safe shutdown of the processing thread.
+ * - Providing mechanisms for a clean and safe shutdown of the processing thread, ending the results with END_OF_STREAM.
  *
  * @version 1.0
  * @date 2024-03-22
@@ -28,38 +29,45 @@ import json
 import logging
 import queue
 import threading
-import time
 import warnings
+from concurrent.futures import Future
 from queue import Queue
 from threading import Event
+from typing import List, Optional, Tuple
 
-from pandas import DataFrame
+import numpy as np
+from pandas import DataFrame, concat
 
-from .database.abstract_database import AbstractDatabase
-from .database.mongodb_database import MongoDbDatabase
+try:
+    import orjson as fast_json
+except ImportError:
+    fast_json = json
+
+from .database_writer import END_OF_STREAM
 from .evaluator.abstract_evaluator import Evaluator
 from .evaluator.lightgbm_evaluator import LightGBMEvaluator
 from .features.feature_extractor import FeatureExtractor
-from .logging.logger import Logger
+from .logging.logger import APP_NAME
 
 warnings.filterwarnings(
     "ignore", category=FutureWarning, module="numpy.core.fromnumeric"
 )
 
+logger = logging.getLogger(APP_NAME)
+
 
 class Extractor(threading.Thread):
     """Class for processing messages and extracting features in a multithreaded environment.
 
     Extends the threading.Thread class to process messages from a queue, extract features,
-    evaluate them, and interact with a database for storage.
+    evaluate them, and pass them to the database writer for storage.
 
     Attributes:
         message_queue (Queue): Queue from which messages are fetched for processing.
         shutdown_event (Event): Event that signals the thread to shutdown.
         daemon (bool): Flag to set this thread as a daemon.
-        logger (Logger): Logger instance for logging information.
+        write_queue (Queue): Queue to which evaluated DataFrames are put for storage.
         feature_extractor (FeatureExtractor): Instance to handle feature extraction.
-        database (AbstractDatabase): Database instance for storing processed data.
         evaluator (Evaluator): Evaluator instance to perform data evaluations.
     """
 
@@ -67,102 +75,178 @@ class Extractor(threading.Thread):
         self,
         message_queue,
         shutdown_event,
-        database_uri,
-        database_name,
+        write_queue,
         number_of_processes,
+        batch_size: int = 64,
     ) -> None:
         """Initialize the Extractor thread with the necessary components.
 
         Args:
             message_queue (Queue): Queue from which messages are to be processed.
             shutdown_event (Event): Event to signal the thread to stop running.
-            database_uri (str): URI for the database connection.
-            database_name (str): Name of the database to connect to.
+            write_queue (Queue): Queue to which evaluated DataFrames are put for storage.
             number_of_processes (int): Number of processes for parallel feature extraction.
+            batch_size (int, optional): Maximum number of queued messages processed together. Defaults to 64.
         """
         super().__init__()
         self.message_queue: Queue = message_queue
         self.shutdown_event: Event = shutdown_event
         self.daemon: bool = True
-        self.logger: Logger = Logger().get_logger()
+        self.write_queue: Queue = write_queue
+        self.batch_size: int = batch_size
         self.feature_extractor: FeatureExtractor = FeatureExtractor(number_of_processes)
-        self.database: AbstractDatabase = MongoDbDatabase(
-            self.logger, database_uri, database_name
-        )
         self.lightgbm_evaluator: Evaluator = LightGBMEvaluator()
 
     def run(self) -> None:
-        """Main execution point for the thread, handling message processing in a loop."""
-        self.database.connect()
+        """Main execution point for the thread, handling message processing in a loop.
 
+        After waiting for a message, whatever else is already queued is taken as well, up to
+        batch_size messages, and the whole batch goes through feature extraction and evaluation at once.
+        While the worker pool extracts the features of one batch, the thread evaluates the previous one.
+        After the last batch, END_OF_STREAM is put on the write queue, so the DatabaseWriter stores everything before exiting.
+        """
+        pending_batch: Optional[Tuple[List[Future], np.ndarray]] = None
         while not self.shutdown_event.is_set() or not self.message_queue.empty():
             try:
-                message = self.message_queue.get()
-                self.process_message(message)
+                messages = [self.message_queue.get(timeout=0.25)]
             except queue.Empty:
-                time.sleep(1)
+                # Nothing else arrived, so the batch in progress is not held back any longer
+                self.finish_batch(pending_batch)
+                pending_batch = None
                 continue
+            while len(messages) < self.batch_size:
+                try:
+                    messages.append(self.message_queue.get_nowait())
+                except queue.Empty:
+                    break
+            submitted_batch = self.submit_batch(messages)
+            self.finish_batch(pending_batch)
+            pending_batch = submitted_batch
+
+        try:
+            self.finish_batch(pending_batch)
+            self.feature_extractor.close()
+        finally:
+            self.write_queue.put(END_OF_STREAM)
 
     def process_message(self, message) -> None:
-        """Process a single message, extract features, and store results in the database.
+        """Process a single message, extract features, and queue the results for storage.
 
         Args:
             message (str or bytes): Message to be processed, may be in string or bytes format.
-
-        Notes:
-            Messages are assumed to be JSON strings that can be decoded and contain 'domains'
-            data for processing. The function handles decoding, data extraction, feature
-            extraction, evaluation, and database storage.
         """
-        if isinstance(message, bytes):
-            message = message.decode("utf-8")
+        self.process_messages([message])
 
-        try:
-            data = json.loads(message)
+    def process_messages(self, messages: List) -> None:
+        """Process a batch of messages together, extract features, and queue the results for storage.
 
-            domains_dict = data.get("domains", {})
+        Args:
+            messages (List[str or bytes]): Messages to be processed, may be in string or bytes format.
+        """
+        self.finish_batch(self.submit_batch(messages))
 
-            df = DataFrame(
-                list(domains_dict.items()), columns=["domain_name", "return_code"]
-            )
+    def submit_batch(
+        self, messages: List
+    ) -> Optional[Tuple[List[Future], np.ndarray]]:
+        """Decode a batch of messages and start extracting the features of their domains.
 
-            df = self.feature_extractor.extract_features(df)
+        Args:
+            messages (List[str or bytes]): Messages to be processed, may be in string or bytes format.
 
-            df_return_code_3 = df[df["return_code"] == 3].drop(columns=["return_code"])
+        Returns:
+            Optional[Tuple[List[Future], np.ndarray]]: Futures of the feature extraction and the mask of
+            the domains with return code 3, or None if the batch carries no domains.
 
-            df_other_return_codes = df[df["return_code"] != 3].drop(
-                columns=["return_code"]
-            )
+        Notes:
+            Messages are assumed to be JSON strings that can be decoded and contain 'domains'
+            data for processing. Messages that cannot be decoded are logged and skipped, the domains
+            of the others are processed as one DataFrame.
+        """
+        domain_names: List[str] = []
+        return_codes: List[np.ndarray] = []
+        for message in messages:
+            domains_dict = self.parse_domains(message)
+            if not domains_dict:
+                continue
+            # Return codes go straight into a compact int16 array, never into Python int lists
+            try:
+                message_return_codes = np.fromiter(
+                    domains_dict.values(), dtype=np.int16, count=len(domains_dict)
+                )
+            except (TypeError, ValueError) as e:
+                logger.error("Invalid return codes in message: %s", e)
+                continue
+            domain_names.extend(domains_dict.keys())
+            return_codes.append(message_return_codes)
 
-            df_return_code_3 = self.lightgbm_evaluator.evaluate(df_return_code_3)
-            df_other_return_codes = self.lightgbm_evaluator.evaluate(
-                df_other_return_codes
-            )
+        if not domain_names:
+            return None
 
-            self.database.insert_dataframe(df_return_code_3)
+        try:
+            # Return codes stay outside the frame, they only decide the split after feature extraction
+            is_return_code_3 = np.concatenate(return_codes) == 3
+            df = DataFrame(
+                {"domain_name": np.array(domain_names, dtype=object)}, copy=False
+            )
 
-            self.database.insert_dataframe(df_other_return_codes)
+            return self.feature_extractor.submit_features(df), is_return_code_3
 
         except ValueError as e:
-            self.logger.error(f"Error processing message: {e}")
-            return
-
-
-
-
-
-
-
-
-
-
+            logger.error("Error processing messages: %s", e)
+            return None
 
+    def finish_batch(
+        self, batch: Optional[Tuple[List[Future], np.ndarray]]
+    ) -> None:
+        """Wait for the features of a submitted batch, evaluate them, and queue the results for storage.
 
+        Args:
+            batch (Optional[Tuple[List[Future], np.ndarray]]): Result of submit_batch, nothing is done for None.
+        """
+        if batch is None:
+            return
+        features, is_return_code_3 = batch
 
+        try:
+            # Feature extraction keeps the row order, so the mask still lines up with the rows
+            df = self.feature_extractor.collect_features(features)
 
+            df_return_code_3 = df.iloc[is_return_code_3]
 
+            df_other_return_codes = df.iloc[~is_return_code_3]
 
+            # Most batches fall into one partition only, the empty one is not evaluated.
+            # Both results go to the same collection, so they are stored as one frame
+            df_results = [
+                self.lightgbm_evaluator.evaluate(df_partition)
+                for df_partition in (df_return_code_3, df_other_return_codes)
+                if not df_partition.empty
+            ]
+            if df_results:
+                self.write_queue.put(concat(df_results, ignore_index=True))
 
+        except ValueError as e:
+            logger.error("Error processing messages: %s", e)
 
+    def parse_domains(self, message) -> Optional[dict]:
+        """Decode a message and return its 'domains' object.
 
+        Args:
+            message (str or bytes): Message to be decoded, may be in string or bytes format.
 
+        Returns:
+            Optional[dict]: The domain names mapped to their return codes, or None if the message
+            cannot be decoded or carries no domains.
+        """
+        try:
+            # Both parsers accept bytes, so the message is not decoded to str first
+            data = fast_json.loads(message)
+        except ValueError as e:
+            logger.error("Error processing message: %s", e)
+            return None
+
+        # Anything but an object with a non-empty "domains" object carries nothing to evaluate
+        domains_dict = data.get("domains") if isinstance(data, dict) else None
+        if not domains_dict or not isinstance(domains_dict, dict):
+            return None
+        return domains_dict
@@ -7,7 +7,9 @@
  * The main functionalities of this file include:
  * - Providing a constant list of keywords associated with phishing attempts to be used across various security checks.
  * - Mapping top-level domains to their abuse scores to assess the risk associated with different domain names.
+ * - Providing an index of these scores for looking up the TLDs of many domain names at once.
  * - Defining character sets for consonants, vowels, and hexadecimal characters to support various text processing tasks.
+ * - Providing byte lookup tables of these character sets for counting characters of many strings at once.
  * - Offering a simple mapping of n-gram names to their numerical counterparts for use in text analysis and feature extraction.
  *
  * @version 1.0
@@ -17,6 +19,9 @@
  *
 """
 
+import numpy as np
+import pandas as pd
+
 PHISHING_KEYWORDS = [
     "account",
     "action",
@@ -110,6 +115,12 @@ based on data from ScoutDNS. A higher score indicates a higher observed rate of
 Source: https://www.scoutdns.com/most-abused-top-level-domains-list-october-scoutdns/
 """
 
+TLD_ABUSE_SCORE_INDEX = pd.Index(list(TLD_ABUSE_SCORES), dtype=object)
+"""Hash index of the TLDs in TLD_ABUSE_SCORES, giving the position of each TLD in TLD_ABUSE_SCORE_VALUES."""
+
+TLD_ABUSE_SCORE_VALUES = np.array([*TLD_ABUSE_SCORES.values(), 0.0], dtype=np.float64)
+"""Abuse scores in the order of TLD_ABUSE_SCORE_INDEX, followed by the score 0 of unknown TLDs at position -1."""
+
 CONSONANTS = "bcdfghjklmnpqrstvwxyz"
 """String of all consonants in the alphabet.
 
@@ -128,6 +139,60 @@ HEX_CHARACTERS = "0123456789ABCDEFabcdef"
 Used in operations requiring hexadecimal validation or processing.
 """
 
+DIGITS = "0123456789"
+"""String of all ASCII digits."""
+
+ALPHANUMERIC_CHARACTERS = DIGITS + "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+"""String of all ASCII letters and digits."""
+
+
+def _byte_lookup_table(characters: str) -> np.ndarray:
+    """Builds a 256-entry table holding 1 at the byte values of the given ASCII characters and 0 elsewhere."""
+    table = np.zeros(256, dtype=np.uint8)
+    table[np.frombuffer(characters.encode("ascii"), dtype=np.uint8)] = 1
+    return table
+
+
+IS_CONSONANT_LUT = _byte_lookup_table(CONSONANTS)
+"""Byte lookup table of CONSONANTS."""
+
+IS_NON_VOWEL_LETTER_LUT = _byte_lookup_table(
+    "".join(
+        letter
+        for letter in ALPHANUMERIC_CHARACTERS
+        if letter.isalpha() and letter.lower() not in VOWELS
+    )
+)
+"""Byte lookup table of ASCII letters not in VOWELS in either case, unlike CONSONANTS it leaves out 'y'."""
+
+IS_VOWEL_LUT = _byte_lookup_table(VOWELS)
+"""Byte lookup table of VOWELS."""
+
+IS_HEX_LUT = _byte_lookup_table(HEX_CHARACTERS)
+"""Byte lookup table of HEX_CHARACTERS."""
+
+IS_DIGIT_LUT = _byte_lookup_table(DIGITS)
+"""Byte lookup table of DIGITS, matching str.isdigit on ASCII characters."""
+
+IS_DOT_LUT = _byte_lookup_table(".")
+"""Byte lookup table of the dot separating the parts of a domain name, no multi-byte UTF-8 character contains its byte."""
+
+IS_NON_ALPHANUMERIC_LUT = 1 - _byte_lookup_table(ALPHANUMERIC_CHARACTERS)
+"""Byte lookup table of everything but ALPHANUMERIC_CHARACTERS, matching not str.isalnum on ASCII characters."""
+
+CHARACTER_CLASS_LUT = (
+    IS_DIGIT_LUT
+    | _byte_lookup_table(VOWELS + VOWELS.upper()) << 1
+    | IS_CONSONANT_LUT << 2
+    | IS_HEX_LUT << 3
+    | IS_NON_ALPHANUMERIC_LUT << 4
+)
+"""Byte lookup table of several character classes at once, holding one bit per class.
+
+Bit 0 marks DIGITS, bit 1 VOWELS in either case, bit 2 CONSONANTS, bit 3 HEX_CHARACTERS
+and bit 4 the non-alphanumeric characters.
+"""
+
 NGRAM_MAPPING = {
     "bi": 2,
     "tri": 3,
@@ -2,7 +2,7 @@
  * @file feature_extractor.py
  * @brief Feature extraction module for domain analysis.
  *
- * This module is designed to extract and compute a variety of lexical, structural, and statistical features from domain names. These features are critical in the identification and analysis of potential DGA domain names. The extraction process leverages multiprocessing for efficient handling of large datasets, ensuring scalability and performance.
+ * This module is designed to extract and compute a variety of lexical, structural, and statistical features from domain names. These features are critical in the identification and analysis of potential DGA domain names. The extraction process leverages a persistent pool of worker processes for efficient handling of large datasets, ensuring scalability and performance.
  *
  * The main functionalities of this module include:
  * - Lexical feature extraction such as domain length, digit presence, and specific keyword counting.
@@ -20,30 +20,42 @@
 """
 
 import os
-import sys
 import warnings
-from multiprocessing import Pool
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Iterator, List, Optional, TextIO
 
 import numpy as np
 import pandas as pd
-import tldextract
 
-from .constants import CONSONANTS, HEX_CHARACTERS, NGRAM_MAPPING, PHISHING_KEYWORDS
+from .constants import (
+    IS_DIGIT_LUT,
+    IS_DOT_LUT,
+    NGRAM_MAPPING,
+    PHISHING_KEYWORDS,
+)
 from .utils import (
+    build_automaton,
     build_automatons,
+    calculate_normalized_entropies,
     calculate_normalized_entropy,
-    consecutive_chars,
+    character_ratio,
+    count_character_classes,
+    count_characters,
+    count_characters_in_set,
+    count_distinct_characters,
     count_subdomains,
+    extract_domain_parts,
     find_ngram_matches,
     generate_ngrams,
     get_lengths_of_parts,
-    get_tld_abuse_score,
+    get_tld_abuse_scores,
     load_ngram_data,
-    longest_consonant_seq,
+    load_public_suffix_list,
+    longest_consecutive_chars,
+    longest_consonant_sequences,
     modified_jaccard_index,
-    ngram_frequency_to_probability,
-    remove_tld,
-    vowel_count,
+    string_lengths,
 )
 
 warnings.filterwarnings(
@@ -51,10 +63,95 @@ warnings.filterwarnings(
 )
 
 
+_worker_extractor: Optional["FeatureExtractor"] = None
+"""FeatureExtractor instance held by each process of the worker pool"""
+
+
+_devnull: Optional[TextIO] = None
+"""Sink for the output silenced during feature extraction, opened once on first use"""
+
+
+def _get_devnull() -> TextIO:
+    """Return the null device opened for writing, so silencing output does not open and close it every time.
+
+    Returns:
+        TextIO: The null device.
+    """
+    global _devnull
+    if _devnull is None:
+        _devnull = open(os.devnull, "w")
+    return _devnull
+
+
+def _initialise_worker(extractor: "FeatureExtractor") -> None:
+    """Store the feature extractor in a pool worker once, so tasks only carry DataFrame splits.
+
+    Args:
+        extractor (FeatureExtractor): The feature extractor used by the worker process.
+    """
+    global _worker_extractor
+    _worker_extractor = extractor
+
+
+def _apply_features_in_worker(df: pd.DataFrame) -> pd.DataFrame:
+    """Extract features from a DataFrame split using the extractor of the pool worker.
+
+    Args:
+        df (pd.DataFrame): A split DataFrame for which features will be extracted.
+
+    Returns:
+        pd.DataFrame: DataFrame with extracted features.
+    """
+    return _worker_extractor._apply_features(df)
+
+
+def _split_rows(df: pd.DataFrame, parts: int) -> Iterator[pd.DataFrame]:
+    """Split a DataFrame into consecutive row slices of nearly equal size, the same sizes as np.array_split.
+
+    The slices are taken with iloc, so the DataFrame is not transposed and copied the way np.array_split does it.
+
+    Args:
+        df (pd.DataFrame): DataFrame to split.
+        parts (int): Number of slices.
+
+    Yields:
+        pd.DataFrame: The slices in the order of the rows.
+    """
+    size, extra = divmod(len(df), parts)
+    start = 0
+    for part in range(parts):
+        stop = start + size + (part < extra)
+        yield df.iloc[start:stop]
+        start = stop
+
+
+def _append_columns(df: pd.DataFrame, columns: dict) -> pd.DataFrame:
+    """Append newly computed feature columns to a DataFrame in a single operation.
+
+    Assigning the columns one by one inserts a block into the DataFrame per column, building a
+    DataFrame from all of them and concatenating it allocates them together.
+
+    Args:
+        df (pd.DataFrame): DataFrame to append the columns to.
+        columns (dict): Column names mapped to Series or arrays with one value per row of df.
+
+    Returns:
+        pd.DataFrame: DataFrame with the columns appended in the given order.
+    """
+    new_columns = pd.DataFrame(
+        {
+            name: values.to_numpy() if isinstance(values, pd.Series) else values
+            for name, values in columns.items()
+        },
+        index=df.index,
+    )
+    return pd.concat([df, new_columns], axis=1, copy=False)
+
+
 class FeatureExtractor:
     """Class responsible for extracting various lexical features from domain names for the purpose of domain analysis.
 
-    The class leverages multiprocessing for efficient processing of large datasets.
+    The class leverages a persistent pool of worker processes for efficient processing of large datasets.
     """
 
     def __init__(self, num_processes: int) -> None:
@@ -64,16 +161,48 @@ class FeatureExtractor:
             num_processes (int): The number of processes to use for parallel computation.
         """
         self.num_processes: int = num_processes
+        self._pool: Optional[ProcessPoolExecutor] = None
         self.initialise_feature_extractor()
 
+    def __getstate__(self) -> dict:
+        """Exclude the worker pool, which cannot be pickled, when the extractor is sent to a worker."""
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Return the worker pool, starting it on first use.
+
+        Returns:
+            ProcessPoolExecutor: Pool of worker processes that hold a copy of this extractor.
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.num_processes,
+                initializer=_initialise_worker,
+                initargs=(self,),
+            )
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool and wait for its processes to exit."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
     def initialise_feature_extractor(self) -> None:
-        """Load n-gram data from files and prepare frequency and probability data structures for feature extraction."""
+        """Load n-gram data from files and prepare the n-gram sets and automatons used for feature extraction.
+
+        Only the n-grams themselves are kept, their frequencies are not needed by any feature.
+        """
+        # Loaded before the worker pool is started, so the workers share the parsed list
+        load_public_suffix_list()
         ngram_freq_dga = load_ngram_data("data/ngram_freq_dga.json")
         ngram_freq_benign = load_ngram_data("data/ngram_freq.json")
 
         self.ngram_aho_corasick_automatons = build_automatons(ngram_freq_dga)
-        self.ngram_prob_dga = ngram_frequency_to_probability(ngram_freq_dga)
-        self.ngram_prob_benign = ngram_frequency_to_probability(ngram_freq_benign)
+        # Distinct keywords found by the automaton are the keywords contained in the domain
+        self.phishing_keyword_automaton = build_automaton(PHISHING_KEYWORDS)
         self.ngram_set_dga = {
             n: set(ngram_freq_dga[f"{n}gram_freq"].keys())
             for n in ["bi", "tri", "penta"]
@@ -92,30 +221,47 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame containing extracted features.
         """
-        df = df.copy(True)
-        df_split = np.array_split(df, self.num_processes)
-        df_features = pd.DataFrame()
+        return self.collect_features(self.submit_features(df))
+
+    def submit_features(self, df: pd.DataFrame) -> List[Future]:
+        """Start extracting features from the input DataFrame without waiting for the worker pool.
 
-        # Redirect stdout and stderr
-        original_stdout = sys.stdout
-        original_stderr = sys.stderr
-        sys.stdout = open(os.devnull, "w")
-        sys.stderr = open(os.devnull, "w")
+        DataFrames with more rows than processes are split among the pool workers, smaller ones
+        are processed right away in the calling thread. No extraction step modifies the DataFrame
+        it is given, every step returns a new one, so the input is used without being copied.
 
-        try:
+        Args:
+            df (pd.DataFrame): DataFrame containing domain names.
+
+        Returns:
+            List[Future]: Futures of the feature DataFrames of the splits, in the order of the rows.
+        """
+        # Output of the extraction is silenced, workers started here inherit the redirection
+        devnull = _get_devnull()
+        with redirect_stdout(devnull), redirect_stderr(devnull):
             if (len(df) > self.num_processes):
-                with Pool(processes=self.num_processes) as pool:
-                    results = pool.map(self._apply_features, df_split)
-                    df_features = pd.concat(results)
-            else:
-                df_features = self._apply_features(df)
-        finally:
-            # Restore stdout and stderr
-            sys.stdout.close()
-            sys.stderr.close()
-            sys.stdout = original_stdout
-            sys.stderr = original_stderr
-        return df_features
+                pool = self._get_pool()
+                return [
+                    pool.submit(_apply_features_in_worker, df_split)
+                    for df_split in _split_rows(df, self.num_processes)
+                ]
+            df_features: Future = Future()
+            df_features.set_result(self._apply_features(df))
+            return [df_features]
+
+    def collect_features(self, futures: List[Future]) -> pd.DataFrame:
+        """Wait for features started with submit_features and combine them into one DataFrame.
+
+        Args:
+            futures (List[Future]): Futures returned by submit_features.
+
+        Returns:
+            pd.DataFrame: DataFrame containing extracted features.
+        """
+        results = [future.result() for future in futures]
+        if len(results) == 1:
+            return results[0]
+        return pd.concat(results)
 
     def _apply_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply the feature extraction methods to a split of the main DataFrame.
@@ -126,7 +272,6 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame with extracted features.
         """
-        df = df.copy(True)
         df = self.extract_temp_collumns(df)
         df = self.extract_basic_features(df)
         df = self.extract_tld_features(df)
@@ -145,34 +290,31 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame updated with basic lexical features.
         """
-        df = df.copy(True)
-        df["lex_name_len"] = df["domain_name"].apply(
-            len
-        )  # Total length of the domain name
-        df["lex_has_digit"] = df["domain_name"].apply(
-            lambda x: 1 if sum([1 for y in x if y.isdigit()]) > 0 else 0
-        )  # Binary indicator of numeric presence in the domain
-        df["lex_phishing_keyword_count"] = df["domain_name"].apply(
-            lambda x: sum(1 for w in PHISHING_KEYWORDS if w in x)
+        features: dict = {}
+        name_lengths = string_lengths(df["domain_name"])
+        features["lex_name_len"] = name_lengths  # Total length of the domain name
+        features["lex_has_digit"] = (
+            count_characters(df["domain_name"], IS_DIGIT_LUT, str.isdigit) > 0
+        ).astype(np.int64)  # Binary indicator of numeric presence in the domain
+        features["lex_phishing_keyword_count"] = df["domain_name"].apply(
+            find_ngram_matches, args=(self.phishing_keyword_automaton,)
         )  # Count of phishing related keywords in the domain
-        df["lex_consecutive_chars"] = df["domain_name"].apply(
-            lambda x: consecutive_chars(x)
+        features["lex_consecutive_chars"] = longest_consecutive_chars(
+            df["domain_name"]
         )  # Count of maximum consecutive characters
-        df["lex_shortest_sub_len"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (
-                min(get_lengths_of_parts(x)) if len(get_lengths_of_parts(x)) > 0 else 0
-            )
+        # The concatenated subdomains hold no dots, so their only part is the whole string
+        features["lex_shortest_sub_len"] = string_lengths(
+            df["tmp_concat_subdomains"]
         )  # Length of the shortest part of the domain (subdomain or second-level domain)
-        df["lex_avg_part_len"] = df["tmp_part_lengths"].apply(
-            lambda x: sum(x) / len(x) if len(x) > 0 else 0
-        )
-        df["lex_stdev_part_lens"] = df["tmp_part_lengths"].apply(
-            lambda x: calculate_normalized_entropy(x) if len(x) > 0 else 0
-        )
-        df["lex_longest_part_len"] = df["tmp_part_lengths"].apply(
-            lambda x: max(x) if len(x) > 0 else 0
+        # Every dot ends one part, so the parts hold all characters but the dots
+        part_counts = count_characters_in_set(df["domain_name"], IS_DOT_LUT) + 1
+        features["lex_avg_part_len"] = (name_lengths - part_counts + 1) / part_counts
+        # Splitting a domain name always gives at least one part, so the part lengths are never empty
+        features["lex_stdev_part_lens"] = df["tmp_part_lengths"].apply(
+            calculate_normalized_entropy
         )
-        return df
+        features["lex_longest_part_len"] = df["tmp_part_lengths"].apply(max)
+        return _append_columns(df, features)
 
     def extract_tld_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract features related to the top-level domain (TLD) from the domain names.
@@ -183,12 +325,12 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame updated with TLD-related features.
         """
-        df = df.copy(True)
-        df["lex_tld_len"] = df["tmp_tld"].apply(len)  # Length of the TLD
-        df["lex_tld_abuse_score"] = df["tmp_tld"].apply(
-            get_tld_abuse_score
+        features: dict = {}
+        features["lex_tld_len"] = string_lengths(df["tmp_tld"])  # Length of the TLD
+        features["lex_tld_abuse_score"] = get_tld_abuse_scores(
+            df["tmp_tld"]
         )  # Abuse score based on the TLD
-        return df
+        return _append_columns(df, features)
 
     def extract_sld_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract features from the second-level domain (SLD) part of the domain names.
@@ -199,54 +341,41 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame updated with SLD-related features.
         """
-
-        df["lex_sld_len"] = df["tmp_sld"].apply(len)  # Length of SLD
-        df["lex_sld_norm_entropy"] = df["tmp_sld"].apply(
-            calculate_normalized_entropy
-        )  # Normalized entropy of the SLD
-        df["lex_sld_digit_count"] = (
+        features: dict = {}
+        # Character classes of all rows are counted in one pass, see count_character_classes
+        sld = count_character_classes(df["tmp_sld"])
+        features["lex_sld_len"] = sld.lengths  # Length of SLD
+        features["lex_sld_norm_entropy"] = calculate_normalized_entropies(
             df["tmp_sld"]
-            .apply(lambda x: (sum([1 for y in x if y.isdigit()])) if len(x) > 0 else 0)
-            .astype("float")
+        )  # Normalized entropy of the SLD
+        features["lex_sld_digit_count"] = sld.digits.astype(
+            np.float64
         )  # Count of digits in the SLD
-        df["lex_sld_digit_ratio"] = df["tmp_sld"].apply(
-            # Digit ratio in the SLD
-            lambda x: (sum([1 for y in x if y.isdigit()]) / len(x)) if len(x) > 0 else 0
-        )
-        df["lex_sld_phishing_keyword_count"] = df["tmp_sld"].apply(
-            lambda x: sum(1 for w in PHISHING_KEYWORDS if w in x)
+        features["lex_sld_digit_ratio"] = character_ratio(
+            sld.digits, sld.lengths
+        )  # Digit ratio in the SLD
+        features["lex_sld_phishing_keyword_count"] = df["tmp_sld"].apply(
+            find_ngram_matches, args=(self.phishing_keyword_automaton,)
         )  # Count of phishing related keywords in the SLD
-        df["lex_sld_vowel_count"] = df["tmp_sld"].apply(
-            lambda x: vowel_count(x)
-        )  # Count of vowels in the SLD
-        df["lex_sld_vowel_ratio"] = df["tmp_sld"].apply(
-            lambda x: (vowel_count(x) / len(x)) if len(x) > 0 else 0
+        features["lex_sld_vowel_count"] = sld.vowels  # Count of vowels in the SLD
+        features["lex_sld_vowel_ratio"] = character_ratio(
+            sld.vowels, sld.lengths
         )  # Ratio of vowels in the SLD
-        df["lex_sld_consonant_count"] = df["tmp_sld"].apply(
-            lambda x: (sum(1 for c in x if c in CONSONANTS)) if len(x) > 0 else 0
-        )  # Count of consonants in the SLD
-        df["lex_sld_consonant_ratio"] = df["tmp_sld"].apply(
-            lambda x: (
-                (sum(1 for c in x if c in CONSONANTS) / len(x)) if len(x) > 0 else 0
-            )
+        features["lex_sld_consonant_count"] = sld.consonants  # Count of consonants in the SLD
+        features["lex_sld_consonant_ratio"] = character_ratio(
+            sld.consonants, sld.lengths
         )  # Ratio of consonants in the SLD
-        df["lex_sld_non_alphanum_count"] = df["tmp_sld"].apply(
-            lambda x: (sum(1 for c in x if not c.isalnum())) if len(x) > 0 else 0
-        )  # Count of non-alphanumeric characters in the SLD
-        df["lex_sld_non_alphanum_ratio"] = df["tmp_sld"].apply(
-            lambda x: (
-                (sum(1 for c in x if not c.isalnum()) / len(x)) if len(x) > 0 else 0
-            )
+        features[
+            "lex_sld_non_alphanum_count"
+        ] = sld.non_alphanumeric  # Count of non-alphanumeric characters in the SLD
+        features["lex_sld_non_alphanum_ratio"] = character_ratio(
+            sld.non_alphanumeric, sld.lengths
         )  # Ratio of non-alphanumeric characters in the SLD
-        df["lex_sld_hex_count"] = df["tmp_sld"].apply(
-            lambda x: (sum(1 for c in x if c in HEX_CHARACTERS)) if len(x) > 0 else 0
-        )  # Count of hexadecimal characters in the SLD
-        df["lex_sld_hex_ratio"] = df["tmp_sld"].apply(
-            lambda x: (
-                (sum(1 for c in x if c in HEX_CHARACTERS) / len(x)) if len(x) > 0 else 0
-            )
+        features["lex_sld_hex_count"] = sld.hex  # Count of hexadecimal characters in the SLD
+        features["lex_sld_hex_ratio"] = character_ratio(
+            sld.hex, sld.lengths
         )  # Ratio of hexadecimal characters in the SLD
-        return df
+        return _append_columns(df, features)
 
     def extract_temp_collumns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Temporarily add necessary columns for feature extraction, such as separating TLD, SLD, etc.
@@ -257,21 +386,27 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame updated with temporary columns for further processing.
         """
-        df = df.copy(True)
-        df["tmp_tld"] = df["domain_name"].apply(
-            lambda x: tldextract.extract(x).suffix
+        # Every domain is looked up in the public suffix list once for all of its parts
+        extracted = [extract_domain_parts(x) for x in df["domain_name"]]
+        features: dict = {}
+        features["tmp_tld"] = pd.Series(
+            [x.suffix for x in extracted], index=df.index, dtype=object
         )  # Extract TLD
-        df["tmp_sld"] = df["domain_name"].apply(
-            lambda x: tldextract.extract(x).domain
+        features["tmp_sld"] = pd.Series(
+            [x.domain for x in extracted], index=df.index, dtype=object
         )  # Extract SLD
-        df["tmp_stld"] = df["tmp_sld"] + "." + df["tmp_tld"]  # Combine SLD and TLD
-        df["tmp_concat_subdomains"] = df["domain_name"].apply(
-            lambda x: remove_tld(x).replace(".", "")
-        )  # Concatenate subdomains without dots
-        df["tmp_part_lengths"] = df["domain_name"].apply(
+        features["tmp_stld"] = (
+            features["tmp_sld"] + "." + features["tmp_tld"]
+        )  # Combine SLD and TLD
+        features["tmp_concat_subdomains"] = pd.Series(
+            [(x.subdomain + x.domain).replace(".", "") for x in extracted],
+            index=df.index,
+            dtype=object,
+        )  # Concatenate subdomains without dots, the same as remove_tld without its dots
+        features["tmp_part_lengths"] = df["domain_name"].apply(
             lambda x: get_lengths_of_parts(x)
         )  # Length of each part of the domain
-        return df
+        return _append_columns(df, features)
 
     def drop_temp_collumns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Remove temporary columns from the DataFrame after feature extraction.
@@ -282,18 +417,15 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: Cleaned DataFrame without temporary columns.
         """
-        df = df.copy(True)
-        df.drop(
+        return df.drop(
             columns=[
                 "tmp_tld",
                 "tmp_sld",
                 "tmp_stld",
                 "tmp_concat_subdomains",
                 "tmp_part_lengths",
-            ],
-            inplace=True,
+            ]
         )
-        return df
 
     def extract_subdomain_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract features related to subdomains in the domain names.
@@ -304,64 +436,49 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame updated with subdomain-related features.
         """
-        df = df.copy(True)
-        df["lex_sub_count"] = df["domain_name"].apply(
+        features: dict = {}
+        features["lex_sub_count"] = df["domain_name"].apply(
             lambda x: count_subdomains(x)
         )  # Count of subdomains
-        df["lex_stld_unique_char_count"] = df["tmp_stld"].apply(
-            # Count of unique characters in combined SLD and TLD
-            lambda x: len(set(x.replace(".", "")))
-        )
-        df["lex_begins_with_digit"] = df["domain_name"].apply(
-            lambda x: 1 if x[0].isdigit() else 0
+        features["lex_stld_unique_char_count"] = count_distinct_characters(
+            df["tmp_stld"], ignored="."
+        )  # Count of unique characters in combined SLD and TLD
+        features["lex_begins_with_digit"] = (
+            df["domain_name"].str[:1].str.isdigit().astype(np.int64)
         )  # Check if the domain starts with a digit
-        df["lex_sub_max_consonant_len"] = df["tmp_concat_subdomains"].apply(
-            longest_consonant_seq
+        features["lex_sub_max_consonant_len"] = longest_consonant_sequences(
+            df["tmp_concat_subdomains"]
         )  # Maximum length of consecutive consonants in subdomains
-        df["lex_sub_norm_entropy"] = df["tmp_concat_subdomains"].apply(
-            # Normalized entropy of concatenated subdomains
-            calculate_normalized_entropy
-        )
-        df["lex_sub_digit_count"] = (
+        features["lex_sub_norm_entropy"] = calculate_normalized_entropies(
             df["tmp_concat_subdomains"]
-            .apply(lambda x: (sum([1 for y in x if y.isdigit()])) if len(x) > 0 else 0)
-            .astype("float")
+        )  # Normalized entropy of concatenated subdomains
+        # Character classes of all rows are counted in one pass, see count_character_classes
+        sub = count_character_classes(df["tmp_concat_subdomains"])
+        features["lex_sub_digit_count"] = sub.digits.astype(
+            np.float64
         )  # Count of digits in concatenated subdomains
-        df["lex_sub_digit_ratio"] = df["tmp_concat_subdomains"].apply(
-            # Digit ratio in concatenated subdomains
-            lambda x: (sum([1 for y in x if y.isdigit()]) / len(x)) if len(x) > 0 else 0
-        )
-        df["lex_sub_vowel_count"] = df["tmp_concat_subdomains"].apply(
-            lambda x: vowel_count(x)
-        )  # Count of vowels in concatenated subdomains
-        df["lex_sub_vowel_ratio"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (vowel_count(x) / len(x)) if len(x) > 0 else 0
+        features["lex_sub_digit_ratio"] = character_ratio(
+            sub.digits, sub.lengths
+        )  # Digit ratio in concatenated subdomains
+        features["lex_sub_vowel_count"] = sub.vowels  # Count of vowels in concatenated subdomains
+        features["lex_sub_vowel_ratio"] = character_ratio(
+            sub.vowels, sub.lengths
         )  # Ratio of vowels in concatenated subdomains
-        df["lex_sub_consonant_count"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (sum(1 for c in x if c in CONSONANTS)) if len(x) > 0 else 0
-        )  # Count of consonants in concatenated subdomains
-        df["lex_sub_consonant_ratio"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (
-                (sum(1 for c in x if c in CONSONANTS) / len(x)) if len(x) > 0 else 0
-            )
+        features["lex_sub_consonant_count"] = sub.consonants  # Count of consonants in concatenated subdomains
+        features["lex_sub_consonant_ratio"] = character_ratio(
+            sub.consonants, sub.lengths
         )  # Ratio of consonants in concatenated subdomains
-        df["lex_sub_non_alphanum_count"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (sum(1 for c in x if not c.isalnum())) if len(x) > 0 else 0
-        )  # Count of non-alphanumeric characters in concatenated subdomains
-        df["lex_sub_non_alphanum_ratio"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (
-                (sum(1 for c in x if not c.isalnum()) / len(x)) if len(x) > 0 else 0
-            )
+        features[
+            "lex_sub_non_alphanum_count"
+        ] = sub.non_alphanumeric  # Count of non-alphanumeric characters in concatenated subdomains
+        features["lex_sub_non_alphanum_ratio"] = character_ratio(
+            sub.non_alphanumeric, sub.lengths
         )  # Ratio of non-alphanumeric characters in concatenated subdomains
-        df["lex_sub_hex_count"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (sum(1 for c in x if c in HEX_CHARACTERS)) if len(x) > 0 else 0
-        )  # Count of hexadecimal characters in concatenated subdomains
-        df["lex_sub_hex_ratio"] = df["tmp_concat_subdomains"].apply(
-            lambda x: (
-                (sum(1 for c in x if c in HEX_CHARACTERS) / len(x)) if len(x) > 0 else 0
-            )
+        features["lex_sub_hex_count"] = sub.hex  # Count of hexadecimal characters in concatenated subdomains
+        features["lex_sub_hex_ratio"] = character_ratio(
+            sub.hex, sub.lengths
         )  # Ratio of hexadecimal characters in concatenated subdomains
-        return df
+        return _append_columns(df, features)
 
     def extract_ngram_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Extract n-gram based features using preloaded n-gram frequency data from benign and malicious sources.
@@ -372,37 +489,42 @@ class FeatureExtractor:
         Returns:
             pd.DataFrame: DataFrame updated with n-gram features.
         """
-        df = df.copy(True)
-        df["lex_dga_bigram_matches"] = df["tmp_concat_subdomains"].apply(
+        features: dict = {}
+        features["lex_dga_bigram_matches"] = df["tmp_concat_subdomains"].apply(
             find_ngram_matches,
             args=(self.ngram_aho_corasick_automatons["bigram_freq"],),
         )  # Count of bigram matches with DGA model
-        df["lex_dga_trigram_matches"] = df["tmp_concat_subdomains"].apply(
+        features["lex_dga_trigram_matches"] = df["tmp_concat_subdomains"].apply(
             find_ngram_matches,
             args=(self.ngram_aho_corasick_automatons["trigram_freq"],),
         )  # Count of trigram matches with DGA model
-        df["lex_dga_tetragram_matches"] = df["tmp_concat_subdomains"].apply(
+        features["lex_dga_tetragram_matches"] = df["tmp_concat_subdomains"].apply(
             find_ngram_matches,
             args=(self.ngram_aho_corasick_automatons["tetragram_freq"],),
         )  # Count of tetragram matches with DGA model
-        df["lex_dga_pentagram_matches"] = df["tmp_concat_subdomains"].apply(
+        features["lex_dga_pentagram_matches"] = df["tmp_concat_subdomains"].apply(
             find_ngram_matches,
             args=(self.ngram_aho_corasick_automatons["pentagram_freq"],),
         )  # Count of pentagram matches with DGA model
 
-        for n, ngram_set in self.ngram_set_benign.items():
-            n_int = NGRAM_MAPPING[n]
-            df[f"mod_jaccard_{n}-grams_benign"] = df["domain_name"].apply(
-                lambda domain: modified_jaccard_index(
-                    generate_ngrams(domain, n_int), ngram_set
-                )
+        # The n-grams of every domain are generated once and compared with both models
+        domain_names = df["domain_name"].tolist()
+        jaccard_benign: dict = {}
+        jaccard_dga: dict = {}
+        for n, ngram_set_benign in self.ngram_set_benign.items():
+            ngram_set_dga = self.ngram_set_dga[n]
+            domain_ngrams = [
+                generate_ngrams(domain, NGRAM_MAPPING[n]) for domain in domain_names
+            ]
+            jaccard_benign[f"mod_jaccard_{n}-grams_benign"] = pd.Series(
+                [modified_jaccard_index(x, ngram_set_benign) for x in domain_ngrams],
+                index=df.index,
             )  # Modified Jaccard index for n-grams with benign model
-        for n, ngram_set in self.ngram_set_dga.items():
-            n_int = NGRAM_MAPPING[n]
-            df[f"mod_jaccard_{n}-grams_dga"] = df["domain_name"].apply(
-                lambda domain: modified_jaccard_index(
-                    generate_ngrams(domain, n_int), ngram_set
-                )
+            jaccard_dga[f"mod_jaccard_{n}-grams_dga"] = pd.Series(
+                [modified_jaccard_index(x, ngram_set_dga) for x in domain_ngrams],
+                index=df.index,
             )  # Modified Jaccard index for n-grams with DGA model
+        features.update(jaccard_benign)
+        features.update(jaccard_dga)
 
-        return df
+        return _append_columns(df, features)
@@ -5,9 +5,14 @@
  * This file contains a collection of utility functions essential at identifying risks associated with DGA domain names.
  *
  * The main functionalities of this file include:
- * - Parsing and extracting components from domain names to facilitate risk assessments.
+ * - Parsing and extracting components from domain names to facilitate risk assessments, caching the parts of recently seen names.
  * - Converting frequency data into probability distributions to aid in statistical analysis.
+ * - Counting characters from a character set in many strings at once with byte lookup tables.
+ * - Counting digits and other character classes of many strings at once, falling back to str methods for non-ASCII strings.
+ * - Counting several character classes of many strings in a single lookup pass.
+ * - Measuring the longest runs of equal characters and of consonants in many strings at once.
  * - Calculating various string metrics such as vowel counts, consecutive character sequences, and entropy, which are crucial in evaluating domain name anomalies.
+ * - Calculating the normalized entropy of many strings at once with the same result as one by one.
  * - Generating and matching n-grams to detect patterns that deviate from benign profiles.
  * - Assessing the abuse risk of top-level domains and quantifying subdomain proliferation to predict domain-based threats.
  *
@@ -19,22 +24,41 @@
 """
 
 import json
+import logging
 import math
 import warnings
 from collections import Counter
+from functools import lru_cache
 from itertools import groupby
-from typing import Optional
+from typing import Callable, Iterable, NamedTuple, Optional, Sequence, Tuple
 
 import ahocorasick
 import numpy as np
+import pandas as pd
 import tldextract
 
-from .constants import TLD_ABUSE_SCORES, VOWELS
+from ..logging.logger import APP_NAME
+from .constants import (
+    CHARACTER_CLASS_LUT,
+    IS_NON_VOWEL_LETTER_LUT,
+    TLD_ABUSE_SCORE_INDEX,
+    TLD_ABUSE_SCORE_VALUES,
+    TLD_ABUSE_SCORES,
+    VOWELS,
+)
 
 warnings.filterwarnings(
     "ignore", category=FutureWarning, module="numpy.core.fromnumeric"
 )
 
+logger = logging.getLogger(APP_NAME)
+
+_LN_2 = math.log(2)
+"""Natural logarithm of 2, the denominator of base 2 logarithms"""
+
+_BIT_COUNTS = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+"""Number of set bits of every byte value."""
+
 
 def load_ngram_data(json_path: str) -> dict:
     """
@@ -48,11 +72,11 @@ def load_ngram_data(json_path: str) -> dict:
             data = json.load(file)
         return data
     except FileNotFoundError:
-        print(f"Error: The file {json_path} was not found.")
+        logger.error("The file %s was not found.", json_path)
     except json.JSONDecodeError:
-        print("Error: The file is not a valid JSON document.")
+        logger.error("The file %s is not a valid JSON document.", json_path)
     except Exception as e:
-        print(f"An unexpected error occurred: {e}")
+        logger.error("An unexpected error occurred: %s", e)
     return {}
 
 
@@ -115,6 +139,21 @@ def get_tld_abuse_score(tld: str) -> int:
     return TLD_ABUSE_SCORES.get(tld, 0)
 
 
+def get_tld_abuse_scores(tlds: pd.Series) -> np.ndarray:
+    """
+    Retrieves the abuse scores for many top-level domains (TLDs) at once.
+
+    The TLDs are hashed in one pass over the score index, unknown TLDs get position -1,
+    which holds the score 0 in the score array.
+
+    @param tlds The top-level domains.
+    @return Array of abuse scores, 0 for TLDs without a score.
+    """
+    positions = TLD_ABUSE_SCORE_INDEX.get_indexer(tlds.str.lstrip("."))
+
+    return TLD_ABUSE_SCORE_VALUES[positions]
+
+
 def vowel_count(domain: str) -> int:
     """
     Counts the number of vowels in a domain name.
@@ -126,6 +165,294 @@ def vowel_count(domain: str) -> int:
     return sum(1 for char in domain.lower() if char in VOWELS)
 
 
+def string_lengths(strings: Sequence[str]) -> np.ndarray:
+    """
+    Measures the length of each of the strings.
+
+    @param strings The strings to measure.
+    @return Array with the number of characters of each string.
+    """
+    return np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+
+
+def _join_encoded(strings: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    UTF-8 encodes the strings into one byte buffer.
+
+    @param strings The strings to encode.
+    @return The bytes of all strings one after another and the number of bytes of each string.
+    """
+    encoded = [string.encode("utf-8", "surrogatepass") for string in strings]
+    byte_lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), byte_lengths
+
+
+def _longest_runs(
+    run_starts: np.ndarray, in_run: np.ndarray, byte_lengths: np.ndarray
+) -> np.ndarray:
+    """
+    Finds the length of the longest run of bytes in each string of a joined byte buffer.
+
+    The length of the run at every byte is its distance from the start of the run, the runs never
+    cross string boundaries as long as the first byte of every string starts a run.
+
+    @param run_starts Whether a run starts at each byte of the buffer.
+    @param in_run Whether each byte of the buffer belongs to a run.
+    @param byte_lengths Number of bytes of each string.
+    @return Array with the length of the longest run in each string, 0 for strings without any.
+    """
+    positions = np.arange(len(run_starts), dtype=np.int64)
+    current_run_start = np.maximum.accumulate(np.where(run_starts, positions, 0))
+    run_lengths = (positions - current_run_start + 1) * in_run
+
+    longest = np.zeros(len(byte_lengths), dtype=np.int64)
+    non_empty = byte_lengths > 0
+    if non_empty.any():
+        string_starts = np.cumsum(byte_lengths) - byte_lengths
+        longest[non_empty] = np.maximum.reduceat(run_lengths, string_starts[non_empty])
+    return longest
+
+
+def _string_starts_mask(byte_lengths: np.ndarray, buffer_length: int) -> np.ndarray:
+    """
+    Marks the first byte of every non-empty string of a joined byte buffer.
+
+    @param byte_lengths Number of bytes of each string.
+    @param buffer_length Number of bytes of the buffer.
+    @return Boolean array that is True at the first byte of each string.
+    """
+    string_starts = np.zeros(buffer_length, dtype=bool)
+    string_starts[(np.cumsum(byte_lengths) - byte_lengths)[byte_lengths > 0]] = True
+    return string_starts
+
+
+def longest_consecutive_chars(strings: Sequence[str]) -> np.ndarray:
+    """
+    Counts the maximum number of consecutive equal characters in each of the strings, see consecutive_chars.
+
+    ASCII strings are scanned all at once in a joined byte buffer, strings with other characters,
+    which take several bytes each, are counted with consecutive_chars.
+
+    @param strings The strings to analyze.
+    @return Array with the maximum count of consecutive characters in each string.
+    """
+    buffer, byte_lengths = _join_encoded(strings)
+    run_starts = _string_starts_mask(byte_lengths, len(buffer))
+    run_starts[1:] |= buffer[1:] != buffer[:-1]
+    longest = _longest_runs(run_starts, np.ones(len(buffer), dtype=bool), byte_lengths)
+
+    for position, string in enumerate(strings):
+        if not string.isascii():
+            longest[position] = consecutive_chars(string)
+    return longest
+
+
+def longest_consonant_sequences(strings: Sequence[str]) -> np.ndarray:
+    """
+    Finds the length of the longest sequence of consonants in each of the strings, see longest_consonant_seq.
+
+    ASCII strings are scanned all at once in a joined byte buffer, strings with other characters,
+    whose letters also count as consonants, are measured with longest_consonant_seq.
+
+    @param strings The strings to analyze.
+    @return Array with the length of the longest consonant sequence in each string.
+    """
+    buffer, byte_lengths = _join_encoded(strings)
+    is_consonant = IS_NON_VOWEL_LETTER_LUT[buffer].astype(bool)
+    run_starts = _string_starts_mask(byte_lengths, len(buffer))
+    run_starts[1:] |= ~is_consonant[:-1]
+    run_starts &= is_consonant
+    longest = _longest_runs(run_starts, is_consonant, byte_lengths)
+
+    for position, string in enumerate(strings):
+        if not string.isascii():
+            longest[position] = longest_consonant_seq(string)
+    return longest
+
+
+def count_characters_in_set(strings: Iterable[str], lookup_table: np.ndarray) -> np.ndarray:
+    """
+    Counts the characters of a character set in each of the strings.
+
+    All strings are UTF-8 encoded into one buffer that is looked up in the table at once and summed per string.
+    Non-ASCII characters only produce bytes above 127, which are not part of the ASCII character set tables,
+    so the counts equal per-character membership tests on the strings.
+
+    @param strings The strings to count the characters in.
+    @param lookup_table 256-entry table with 1 at the byte values of the character set, see constants.
+    @return Array with the number of characters from the set in each string.
+    """
+    buffer, byte_lengths = _join_encoded(strings)
+    return _sum_per_string(lookup_table[buffer], byte_lengths)
+
+
+def _sum_per_string(hits: np.ndarray, byte_lengths: np.ndarray) -> np.ndarray:
+    """
+    Sums the values of a joined byte buffer per string.
+
+    @param hits Value of each byte of the buffer.
+    @param byte_lengths Number of bytes of each string.
+    @return Array with the sum of the values of each string.
+    """
+    # Empty strings own no bytes, so every non-empty string is summed up to the start of the next one
+    sums = np.zeros(len(byte_lengths), dtype=np.int64)
+    non_empty = byte_lengths > 0
+    if non_empty.any():
+        string_starts = np.cumsum(byte_lengths) - byte_lengths
+        sums[non_empty] = np.add.reduceat(hits, string_starts[non_empty], dtype=np.int64)
+    return sums
+
+
+def count_characters(
+    strings: Sequence[str], lookup_table: np.ndarray, predicate: Callable[[str], bool]
+) -> np.ndarray:
+    """
+    Counts the characters satisfying a predicate in each of the strings.
+
+    ASCII strings are counted all at once with the byte lookup table of the predicate, see count_characters_in_set.
+    Strings with other characters are counted with the predicate itself, because str methods such as
+    isdigit and isalnum also accept many non-ASCII characters.
+
+    @param strings The strings to count the characters in.
+    @param lookup_table 256-entry table with 1 at the ASCII byte values accepted by the predicate, see constants.
+    @param predicate Function deciding whether a single character is counted.
+    @return Array with the number of matching characters in each string.
+    """
+    counts = count_characters_in_set(strings, lookup_table)
+    for position, string in enumerate(strings):
+        if not string.isascii():
+            counts[position] = sum(map(predicate, string))
+    return counts
+
+
+class CharacterCounts(NamedTuple):
+    """Numbers of characters of each class, with one element per string."""
+
+    lengths: np.ndarray
+    digits: np.ndarray
+    vowels: np.ndarray
+    consonants: np.ndarray
+    hex: np.ndarray
+    non_alphanumeric: np.ndarray
+
+
+def is_non_alphanumeric(character: str) -> bool:
+    """
+    Checks whether a character is neither a letter nor a digit.
+
+    @param character The character to check.
+    @return True if the character is not alphanumeric.
+    """
+    return not character.isalnum()
+
+
+def count_character_classes(strings: Sequence[str]) -> CharacterCounts:
+    """
+    Counts the digits, vowels, consonants, hexadecimal and non-alphanumeric characters of each of the strings.
+
+    The strings are encoded into one buffer only once and looked up in CHARACTER_CLASS_LUT, which marks
+    every class with its own bit, so all classes come out of a single lookup pass.
+    Vowels are counted regardless of case, consonants and hexadecimal characters as they are.
+    For strings with non-ASCII characters, digits, vowels and non-alphanumeric characters are recounted
+    with str methods, which also accept non-ASCII characters, and with vowel_count.
+
+    @param strings The strings to count the characters in.
+    @return CharacterCounts of the strings.
+    """
+    buffer, byte_lengths = _join_encoded(strings)
+    classes = CHARACTER_CLASS_LUT[buffer]
+    digits, vowels, consonants, hex_characters, non_alphanumeric = (
+        _sum_per_string((classes >> bit) & 1, byte_lengths) for bit in range(5)
+    )
+
+    for position, string in enumerate(strings):
+        if not string.isascii():
+            digits[position] = sum(map(str.isdigit, string))
+            vowels[position] = vowel_count(string)
+            non_alphanumeric[position] = sum(map(is_non_alphanumeric, string))
+
+    return CharacterCounts(
+        lengths=string_lengths(strings),
+        digits=digits,
+        vowels=vowels,
+        consonants=consonants,
+        hex=hex_characters,
+        non_alphanumeric=non_alphanumeric,
+    )
+
+
+def count_distinct_characters(strings: Sequence[str], ignored: str = "") -> np.ndarray:
+    """
+    Counts the distinct characters in each of the strings, leaving out the ignored ones.
+
+    ASCII strings are counted all at once: the bytes of every string are ORed into a 128-bit mask
+    of two 64-bit words and the set bits of the mask are counted. Strings with other characters
+    are counted with a set of their characters.
+
+    @param strings The strings to count the characters in.
+    @param ignored ASCII characters that are not counted.
+    @return Array with the number of distinct characters in each string.
+    """
+    buffer, byte_lengths = _join_encoded(strings)
+    bits = np.left_shift(np.uint64(1), (buffer & 63).astype(np.uint64))
+    bits[np.isin(buffer, np.frombuffer(ignored.encode("ascii"), dtype=np.uint8))] = 0
+    is_upper_half = buffer >= 64
+
+    masks = np.zeros((len(byte_lengths), 2), dtype=np.uint64)
+    non_empty = byte_lengths > 0
+    if non_empty.any():
+        string_starts = (np.cumsum(byte_lengths) - byte_lengths)[non_empty]
+        masks[non_empty, 0] = np.bitwise_or.reduceat(
+            np.where(is_upper_half, np.uint64(0), bits), string_starts
+        )
+        masks[non_empty, 1] = np.bitwise_or.reduceat(
+            np.where(is_upper_half, bits, np.uint64(0)), string_starts
+        )
+    counts = _BIT_COUNTS[masks.view(np.uint8)].sum(axis=1)
+
+    for position, string in enumerate(strings):
+        if not string.isascii():
+            counts[position] = len(set(string).difference(ignored))
+    return counts
+
+
+def character_ratio(counts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Divides character counts by string lengths, giving 0 for empty strings.
+
+    @param counts Number of characters of interest in each string.
+    @param lengths Length of each string.
+    @return Array of the ratios.
+    """
+    return np.divide(
+        counts, lengths, out=np.zeros(len(counts), dtype=np.float64), where=lengths > 0
+    )
+
+
+def load_public_suffix_list() -> None:
+    """
+    Makes tldextract load the public suffix list right away instead of on the first parsed domain.
+
+    The list is read from the tldextract cache, or downloaded when the cache is empty. Worker processes
+    forked after it was loaded inherit it and never load it themselves.
+    """
+    tldextract.extract("example.com")
+
+
+@lru_cache(maxsize=1 << 15)
+def extract_domain_parts(domain: str) -> tldextract.tldextract.ExtractResult:
+    """
+    Splits a domain name into its subdomain, domain and suffix with tldextract.
+
+    The public suffix list is searched once per distinct domain name, later calls for the same name,
+    from the other features of the same batch or from later batches, reuse the cached parts.
+
+    @param domain Full domain name.
+    @return The parts of the domain name.
+    """
+    return tldextract.extract(domain)
+
+
 def remove_tld(domain: str) -> str:
     """
     Removes the top-level domain (TLD) from a full domain name.
@@ -133,7 +460,7 @@ def remove_tld(domain: str) -> str:
     @param domain Full domain name.
     @return Domain name without the TLD.
     """
-    extracted = tldextract.extract(domain)
+    extracted = extract_domain_parts(domain)
 
     non_tld_parts = [part for part in [extracted.subdomain, extracted.domain] if part]
 
@@ -147,7 +474,7 @@ def count_subdomains(domain: str) -> int:
     @param domain The full domain name.
     @return Number of subdomains.
     """
-    subdomain = tldextract.extract(domain).subdomain
+    subdomain = extract_domain_parts(domain).subdomain
 
     if not subdomain:
         return 0
@@ -204,14 +531,23 @@ def build_automatons(
     @param ngram_freqs: Dictionary where keys are n-gram types (e.g., "bigram_freq") and values are dictionaries of n-grams.
     @return: Dictionary of Aho-Corasick automatons for each n-gram type.
     """
-    automatons = {}
-    for ngram_type, ngrams in ngram_freqs.items():
-        automaton = ahocorasick.Automaton()
-        for ngram in ngrams:
-            automaton.add_word(ngram, ngram)
-        automaton.make_automaton()
-        automatons[ngram_type] = automaton
-    return automatons
+    return {
+        ngram_type: build_automaton(ngrams) for ngram_type, ngrams in ngram_freqs.items()
+    }
+
+
+def build_automaton(words: Iterable[str]) -> ahocorasick.Automaton:
+    """
+    Builds an Aho-Corasick automaton finding all of the given words in a single pass over a text.
+
+    @param words: Words to search for, each word is reported as the value of its matches.
+    @return: Aho-Corasick automaton of the words.
+    """
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
 
 
 def modified_jaccard_index(set1: set, set2: set) -> float:
@@ -267,6 +603,66 @@ def calculate_normalized_entropy(text: str) -> Optional[float]:
 
     entropy = 0.0
     for f in freqs.values():
-        p = float(f) / text_len
-        entropy -= p * math.log(p, 2)
+        p = f / text_len
+        # math.log(p, 2) divides by math.log(2) itself, so the result is the same without the second logarithm
+        entropy -= p * (math.log(p) / _LN_2)
     return entropy / text_len
+
+
+def calculate_normalized_entropies(strings: Sequence[str]) -> np.ndarray:
+    """
+    Calculates the normalized entropy of each of the strings, see calculate_normalized_entropy.
+
+    ASCII strings are handled all at once in a joined byte buffer. The characters of every string are
+    counted in the order of their first occurrence and the entropy terms are subtracted in that order,
+    one distinct character of all strings per step, so every sum is formed exactly like in
+    calculate_normalized_entropy. Logarithms are taken with math.log once per distinct probability.
+    Strings with other characters, which take several bytes each, are handled by calculate_normalized_entropy.
+
+    @param strings The strings to analyze.
+    @return Array with the normalized entropy of each string, 0 for empty strings.
+    """
+    buffer, byte_lengths = _join_encoded(strings)
+    entropies = np.zeros(len(byte_lengths), dtype=np.float64)
+    if len(buffer) == 0:
+        return entropies
+
+    # Sorting by string and byte groups the occurrences of every character of a string
+    string_ids = np.repeat(np.arange(len(byte_lengths), dtype=np.int64), byte_lengths)
+    keys = string_ids * 256 + buffer
+    by_key = np.argsort(keys, kind="stable")
+    sorted_keys = keys[by_key]
+    group_starts = np.flatnonzero(
+        np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+    )
+    first_positions = by_key[group_starts]
+    character_counts = np.zeros(len(buffer), dtype=np.int64)
+    character_counts[first_positions] = np.diff(np.append(group_starts, len(buffer)))
+
+    positions = np.sort(first_positions)
+    character_strings = string_ids[positions]
+    probabilities = character_counts[positions] / byte_lengths[character_strings]
+    distinct_probabilities, inverse = np.unique(probabilities, return_inverse=True)
+    logarithms = np.array([math.log(p) for p in distinct_probabilities], dtype=np.float64)
+    terms = probabilities * (logarithms[inverse] / _LN_2)
+
+    # A string holds at most 256 distinct bytes, so the rank of a character fits into uint8
+    characters_per_string = np.bincount(character_strings, minlength=len(byte_lengths))
+    ranks = np.arange(len(positions)) - np.repeat(
+        np.cumsum(characters_per_string) - characters_per_string, characters_per_string
+    )
+    by_rank = np.argsort(ranks.astype(np.uint8), kind="stable")
+    rank_starts = np.searchsorted(
+        ranks[by_rank], np.arange(characters_per_string.max() + 1)
+    )
+    for start, stop in zip(rank_starts[:-1], rank_starts[1:]):
+        selected = by_rank[start:stop]
+        entropies[character_strings[selected]] -= terms[selected]
+
+    non_empty = byte_lengths > 0
+    entropies[non_empty] /= byte_lengths[non_empty]
+
+    for position, string in enumerate(strings):
+        if not string.isascii():
+            entropies[position] = calculate_normalized_entropy(string)
+    return entropies
@@ -25,11 +25,14 @@ import logging
 import platform
 from logging import Formatter
 
+APP_NAME = "DGA-Detector"
+"""Name of the application logger shared by all modules"""
+
 
 class Logger:
     """A class for creating and configuring a logger with both console and OS-specific logging capabilities."""
 
-    def __init__(self, app_name: str = "DGA-Detector"):
+    def __init__(self, app_name: str = APP_NAME):
         """Initialize the Logger instance.
         Args:
             app_name (str): The name of the application for which logging is set up. Defaults to 'DGA-Detector'.
@@ -18,13 +18,16 @@
  *
 """
 
+import logging
 import threading
 import time
 from queue import Queue
 
 import pika
 
-from .logging.logger import Logger
+from .logging.logger import APP_NAME
+
+logger = logging.getLogger(APP_NAME)
 
 
 class RabbitMQConsumer(threading.Thread):
@@ -70,7 +73,6 @@ class RabbitMQConsumer(threading.Thread):
         self.retry_delay: int = retry_delay
         self.max_retries: int = max_retries
         self.daemon: bool = True
-        self.logger: Logger = Logger().get_logger()
 
     def run(self):
         """Start the RabbitMQ consumer thread."""
@@ -83,14 +85,14 @@ class RabbitMQConsumer(threading.Thread):
                 pika.exceptions.AMQPConnectionError,
                 pika.exceptions.AMQPChannelError,
             ) as e:
-                self.logger.error(f"Connection attempt failed: {e}")
+                logger.error("Connection attempt failed: %s", e)
                 time.sleep(self.retry_delay * (2**attempt))
                 attempt += 1
             except Exception as e:
-                self.logger.error(f"Unexpected error: {e}")
+                logger.error("Unexpected error: %s", e)
                 break
         if attempt > self.max_retries:
-            self.logger.error("Maximum retry attempts reached. Exiting.")
+            logger.error("Maximum retry attempts reached. Exiting.")
             self.shutdown_event.set()
 
     def connect_and_consume(self):
@@ -105,7 +107,8 @@ class RabbitMQConsumer(threading.Thread):
             """Callback function for handling consumed messages."""
             if not self.shutdown_event.is_set():
                 self.message_queue.put(body)
-                self.logger.debug(f"Message received and put into queue: {body}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Message received and put into queue: %s", body)
                 ch.basic_ack(delivery_tag=method.delivery_tag)
             else:
                 ch.stop_consuming()
@@ -119,13 +122,13 @@ class RabbitMQConsumer(threading.Thread):
                 channel.start_consuming()
         except pika.exceptions.ConnectionClosedByBroker:
             if not self.shutdown_event.is_set():
-                self.logger.warning(
+                logger.warning(
                     "Connection closed by broker, attempting to reconnect..."
                 )
                 self.connect_and_consume()
         finally:
             if connection.is_open:
                 connection.close()
-                self.logger.info("RabbitMQ connection closed.")
+                logger.info("RabbitMQ connection closed.")
 
 
@@ -19,13 +19,24 @@
 
 import argparse
 import json
+import os
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 from multiprocessing import cpu_count
 
+try:
+    import orjson as fast_json
+except ImportError:
+    fast_json = json
+
 from src.logging.logger import Logger
 from src.utils.return_codes import ReturnCodes
 
+CONFIG_FILE = "appsettings.json"
+
+_CONFIG_CACHE: Dict[Tuple[int, int], Dict[str, Any]] = {}
+"""Parsed configuration files keyed by (inode, modification time in ns)"""
+
 
 class Arguments:
     """
@@ -59,12 +70,28 @@ class Arguments:
         """
         Loads configuration from 'appsettings.json' if available.
 
+        The parsed file is cached per inode and modification time, so repeated instantiations
+        reuse it until the file changes.
+
         Returns:
             dict: A dictionary containing configuration settings loaded from 'appsettings.json'.
         """
         try:
-            with open("appsettings.json", "r") as file:
-                return json.load(file)
+            stat = os.stat(CONFIG_FILE)
+            cache_key = (stat.st_ino, stat.st_mtime_ns)
+        except OSError:
+            cache_key = None
+
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        try:
+            with open(CONFIG_FILE, "rb") as file:
+                config = fast_json.loads(file.read())
+            if cache_key is not None:
+                _CONFIG_CACHE[cache_key] = config
+            return dict(config)
         except FileNotFoundError:
             self.logger.error("appsettings.json not found. Using default values.")
         except json.JSONDecodeError:
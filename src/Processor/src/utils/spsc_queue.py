@@ -0,0 +1,143 @@
+"""
+ * @file spsc_queue.py
+ * @brief Bounded single-producer single-consumer queue backed by a ring buffer.
+ *
+ * This file contains the implementation of the SPSCQueue class, a bounded FIFO queue for exactly one producer thread and one consumer thread. It exposes the put/get interface of queue.Queue, so it can be used in its place between the RabbitMQ consumer and the Extractor.
+ *
+ * The main functionalities of this file include:
+ * - Storing items in a preallocated ring buffer with separate head and tail indices.
+ * - Putting and getting items without taking a lock while the queue is neither full nor empty.
+ * - Blocking the producer on a full queue and the consumer on an empty queue, with optional timeouts.
+ * - Raising queue.Full and queue.Empty like queue.Queue for non-blocking and timed-out calls.
+ *
+ * @version 1.0
+ * @date 2024-03-22
+ * @author Matej Keznikl (matej.keznikl@gmail.com)
+ * @copyright Copyright (c) 2024
+ *
+"""
+
+import threading
+import time
+from queue import Empty, Full
+from typing import Any, List, Optional
+
+
+class SPSCQueue:
+    """
+    Bounded FIFO queue for a single producer thread and a single consumer thread.
+
+    The tail index is only written by the producer and the head index only by the consumer, and
+    each index assignment is atomic under the GIL, so the common case of put and get takes no lock.
+    The threading events are only touched when a side has to wait for the other one.
+
+    Attributes:
+        maxsize (int): The maximum number of items the queue can hold.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """
+        Initialize the SPSCQueue.
+
+        Args:
+            maxsize (int): The maximum number of items the queue can hold, must be positive.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize: int = maxsize
+        self._capacity: int = maxsize + 1
+        self._buffer: List[Any] = [None] * self._capacity
+        self._head: int = 0
+        self._tail: int = 0
+        self._not_empty: threading.Event = threading.Event()
+        self._not_full: threading.Event = threading.Event()
+
+    def qsize(self) -> int:
+        """Return the approximate number of items in the queue."""
+        return (self._tail - self._head) % self._capacity
+
+    def empty(self) -> bool:
+        """Return True if the queue is empty, False otherwise."""
+        return self._head == self._tail
+
+    def full(self) -> bool:
+        """Return True if the queue is full, False otherwise."""
+        return (self._tail + 1) % self._capacity == self._head
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Put an item into the queue. Must only be called from the producer thread.
+
+        Args:
+            item (Any): The item to put into the queue.
+            block (bool, optional): Whether to wait for a free slot. Defaults to True.
+            timeout (float, optional): The maximum number of seconds to wait. Defaults to None (no limit).
+
+        Raises:
+            Full: If no free slot became available.
+        """
+        next_tail = (self._tail + 1) % self._capacity
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while next_tail == self._head:
+            self._wait(self._not_full, lambda: next_tail != self._head, block, deadline, Full)
+
+        self._buffer[self._tail] = item
+        self._tail = next_tail
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """
+        Remove and return an item from the queue. Must only be called from the consumer thread.
+
+        Args:
+            block (bool, optional): Whether to wait for an item. Defaults to True.
+            timeout (float, optional): The maximum number of seconds to wait. Defaults to None (no limit).
+
+        Returns:
+            Any: The oldest item in the queue.
+
+        Raises:
+            Empty: If no item became available.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._head == self._tail:
+            self._wait(self._not_empty, lambda: self._head != self._tail, block, deadline, Empty)
+
+        item = self._buffer[self._head]
+        self._buffer[self._head] = None
+        self._head = (self._head + 1) % self._capacity
+        if not self._not_full.is_set():
+            self._not_full.set()
+        return item
+
+    def put_nowait(self, item: Any) -> None:
+        """Put an item into the queue without blocking."""
+        self.put(item, block=False)
+
+    def get_nowait(self) -> Any:
+        """Remove and return an item from the queue without blocking."""
+        return self.get(block=False)
+
+    @staticmethod
+    def _wait(event, ready, block, deadline, exception) -> None:
+        """
+        Wait until the other side signals the event or the deadline passes.
+
+        The event is cleared before the condition is checked again, so a signal sent between the
+        caller's check and the wait cannot be lost.
+
+        Raises:
+            Full or Empty: If waiting is not allowed or the deadline has passed.
+        """
+        if not block:
+            raise exception
+        event.clear()
+        if ready():
+            return
+        if deadline is None:
+            event.wait()
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not event.wait(remaining):
+            raise exception
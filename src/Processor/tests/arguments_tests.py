@@ -12,6 +12,7 @@
  * - Checking the handling of missing required arguments.
  * - Ensuring all required arguments are provided via command line override.
  * - Testing the parser's graceful handling of unexpected arguments.
+ * - Testing that an unchanged appsettings.json is parsed only once.
  *
  * @version 1.0
  * @date 2024-03-22
@@ -21,12 +22,14 @@
 """
 
 import json
+import os
 import sys
 import unittest
 from unittest.mock import mock_open, patch
 
 sys.path.append("..")
 
+from src.utils import arguments
 from src.utils.arguments import Arguments
 from src.utils.return_codes import ReturnCodes
 
@@ -130,3 +133,24 @@ class ArgumentsTests(unittest.TestCase):
             args = Arguments(self.logger_mock)
             args.parse_args()
             mock_exit.assert_called_once()
+
+    def test_config_cached_until_file_changes(self):
+        """Test that appsettings.json is parsed again only after it changes."""
+        self.addCleanup(arguments._CONFIG_CACHE.clear)
+        stat = os.stat_result((0o644, 1, 0, 1, 0, 0, 0, 0, 0, 0), {"st_mtime_ns": 0})
+        changed_stat = os.stat_result(
+            (0o644, 1, 0, 1, 0, 0, 0, 0, 1, 0), {"st_mtime_ns": 1000000000}
+        )
+        with patch("os.stat", return_value=stat), patch(
+            "builtins.open", mock_open(read_data=self.appsettings_json)
+        ) as mock_file:
+            first = Arguments(self.logger_mock)
+            second = Arguments(self.logger_mock)
+            self.assertEqual(mock_file.call_count, 1)
+            self.assertEqual(second.config, first.config)
+        with patch("os.stat", return_value=changed_stat), patch(
+            "builtins.open", mock_open(read_data="{}")
+        ) as mock_file:
+            third = Arguments(self.logger_mock)
+            self.assertEqual(mock_file.call_count, 1)
+            self.assertEqual(third.config, {})
@@ -0,0 +1,112 @@
+"""
+ * @file database_tests.py
+ * @brief Test suite for the MongoDB database class.
+ *
+ * This file contains unit tests for the MongoDbDatabase class in the src.database module.
+ * The collection is replaced by a mock, so no MongoDB server is needed.
+ *
+ * Main functionalities of this file include:
+ * - Testing the options insert_dataframe sends with insert_many for unacknowledged and acknowledged inserts.
+ * - Testing that all rows are inserted unacknowledged when fast_insert is left at its default.
+ *
+ * @version 1.0
+ * @date 2024-03-22
+ * @author Matej Keznikl (matej.keznikl@gmail.com)
+ * @copyright Copyright (c) 2024
+ *
+"""
+
+import logging
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+sys.path.append("..")
+
+from src.database.mongodb_database import MongoDbDatabase
+
+
+class MongoDbDatabaseTests(unittest.TestCase):
+    """
+    A class containing unit tests for the MongoDbDatabase class.
+    """
+
+    def setUp(self):
+        """
+        Set up a database instance whose client, database and collection are mocks.
+        """
+        self.database = MongoDbDatabase(
+            logging.getLogger(__name__), "mongodb://localhost:27017", "test"
+        )
+        self.database.client = MagicMock()
+        self.database.db = MagicMock()
+        self.database.collection = MagicMock()
+        self.unacknowledged_collection = MagicMock()
+        self.database.collection.with_options.return_value = (
+            self.unacknowledged_collection
+        )
+        self.df = pd.DataFrame(
+            {
+                "domain_name": ["example.com", "x7k2q9zz.net"],
+                "predict_prob": [0.1, 0.9],
+                "binary_pred": [0, 1],
+            }
+        )
+
+    def tearDown(self):
+        """
+        Stop the insert threads of the database instance.
+        """
+        self.database.close()
+
+    def test_fast_insert_is_unacknowledged_without_validation_bypass(self):
+        """
+        Test that unacknowledged inserts do not ask to bypass document validation, which pymongo rejects.
+        """
+        self.database.insert_dataframe(self.df, fast_insert=True)
+
+        write_concern = self.database.collection.with_options.call_args.kwargs[
+            "write_concern"
+        ]
+        self.assertEqual(write_concern.document, {"w": 0})
+        self.unacknowledged_collection.insert_many.assert_called_once()
+        options = self.unacknowledged_collection.insert_many.call_args.kwargs
+        self.assertEqual(options, {"ordered": False})
+        self.database.collection.insert_many.assert_not_called()
+
+    def test_acknowledged_insert_bypasses_validation(self):
+        """
+        Test that acknowledged inserts go to the collection itself and bypass document validation.
+        """
+        self.database.insert_dataframe(self.df, fast_insert=False)
+
+        self.database.collection.with_options.assert_not_called()
+        self.database.collection.insert_many.assert_called_once()
+        options = self.database.collection.insert_many.call_args.kwargs
+        self.assertEqual(
+            options, {"ordered": False, "bypass_document_validation": True}
+        )
+
+    def test_insert_with_default_fast_insert(self):
+        """
+        Test that by default every row is inserted unacknowledged and without bypassing document validation.
+        """
+        self.database.insert_dataframe(self.df)
+
+        self.unacknowledged_collection.insert_many.assert_called_once()
+        documents, *_ = self.unacknowledged_collection.insert_many.call_args.args
+        self.assertEqual(
+            [document["DomainName"] for document in documents],
+            ["example.com", "x7k2q9zz.net"],
+        )
+        self.assertEqual(
+            self.unacknowledged_collection.insert_many.call_args.kwargs,
+            {"ordered": False},
+        )
+        self.database.collection.insert_many.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,13 +17,16 @@
  *
 """
 
+import os
 import sys
 import unittest
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
 sys.path.append("..")
 
+from src.evaluator import lightgbm_evaluator
 from src.evaluator.abstract_evaluator import Evaluator
 from src.evaluator.lightgbm_evaluator import LightGBMEvaluator
 
@@ -128,4 +131,19 @@ class EvaluatorTests(unittest.TestCase):
 
         self.assertTrue(output.empty)
 
-        
\ No newline at end of file
+    def test_failed_compilation_is_logged_and_cleaned_up(self):
+        """
+        Test that a failed model compilation is logged, leaves no build directory behind and falls back to the Booster.
+        """
+        compiler = MagicMock()
+        compiler.export_lib.side_effect = RuntimeError("no compiler")
+        with patch.object(lightgbm_evaluator, "tl2cgen", compiler), patch.object(
+            lightgbm_evaluator, "treelite", MagicMock()
+        ):
+            with self.assertLogs(lightgbm_evaluator.logger, level="ERROR") as logs:
+                predictor = self.evaluator._compile_model("lightgbm_model.joblib")
+
+        self.assertIsNone(predictor)
+        self.assertIn("no compiler", logs.output[0])
+        library_path = compiler.export_lib.call_args.kwargs["libpath"]
+        self.assertFalse(os.path.exists(os.path.dirname(library_path)))
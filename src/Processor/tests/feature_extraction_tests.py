@@ -28,6 +28,7 @@ from pandas import DataFrame
 sys.path.append("..")
 
 from src.features.feature_extractor import FeatureExtractor
+from src.features.utils import calculate_normalized_entropy
 
 
 class FeatureExtractionTests(unittest.TestCase):
@@ -303,3 +304,32 @@ class FeatureExtractionTests(unittest.TestCase):
         self.assertEqual(result_df.iloc[0]["lex_has_digit"], 0)
         self.assertTrue(result_df.iloc[0]["lex_sub_non_alphanum_count"] > 0)
 
+    def test_character_runs_of_several_domains(self):
+        """
+        Test longest character runs of several domains scanned at once.
+        """
+        df = DataFrame(
+            {
+                "domain_name": ["aaab.com", "", "xyzzz.net", "müüünchen.de"],
+                "tmp_concat_subdomains": ["aaab", "", "xyzzz", "müüünchen"],
+                "tmp_part_lengths": [[4, 3], [0], [5, 3], [9, 2]],
+            }
+        )
+        result_df = self.extractor.extract_basic_features(df)
+        self.assertEqual(list(result_df["lex_consecutive_chars"]), [3, 0, 3, 3])
+
+        df["tmp_stld"] = ["aaab.com", "", "xyzzz.net", "müüünchen.de"]
+        result_df = self.extractor.extract_subdomain_features(df.iloc[[0, 2, 3]])
+        self.assertEqual(list(result_df["lex_sub_max_consonant_len"]), [1, 3, 7])
+        self.assertEqual(list(result_df["lex_stld_unique_char_count"]), [5, 6, 7])
+
+    def test_entropy_of_several_slds(self):
+        """
+        Test normalized entropy of several SLDs computed at once.
+        """
+        slds = ["google", "", "x7k2q9zz", "aaaa", "münchen"]
+        result_df = self.extractor.extract_sld_features(DataFrame({"tmp_sld": slds}))
+        self.assertEqual(
+            list(result_df["lex_sld_norm_entropy"]),
+            [calculate_normalized_entropy(sld) for sld in slds],
+        )
@@ -0,0 +1,89 @@
+"""
+ * @file spsc_queue_tests.py
+ * @brief Unit tests for the SPSCQueue class.
+ *
+ * This file contains unit tests for the SPSCQueue class, the bounded single-producer single-consumer queue placed between the RabbitMQ consumer and the Extractor.
+ * The tests cover ordering, capacity limits, non-blocking and timed-out calls, and handing items over between two threads.
+ *
+ * Main functionalities of this file include:
+ * - Testing FIFO ordering and size reporting.
+ * - Testing queue.Full and queue.Empty behavior on full and empty queues.
+ * - Testing that a blocked consumer is woken by the producer.
+ * - Testing a producer and a consumer thread exchanging many items.
+ *
+ * @version 1.0
+ * @date 2024-03-22
+ * @author Matej Keznikl (matej.keznikl@gmail.com)
+ * @copyright Copyright (c) 2024
+ *
+"""
+
+import sys
+import threading
+import unittest
+from queue import Empty, Full
+
+sys.path.append("..")
+
+from src.utils.spsc_queue import SPSCQueue
+
+
+class SPSCQueueTests(unittest.TestCase):
+    """A set of test cases for the SPSCQueue class."""
+
+    def test_fifo_order(self):
+        """Test that items are returned in insertion order."""
+        queue = SPSCQueue(3)
+        for item in ("a", "b", "c"):
+            queue.put(item)
+        self.assertEqual(queue.qsize(), 3)
+        self.assertEqual([queue.get(), queue.get(), queue.get()], ["a", "b", "c"])
+        self.assertTrue(queue.empty())
+
+    def test_invalid_size(self):
+        """Test that a non-positive size is rejected."""
+        with self.assertRaises(ValueError):
+            SPSCQueue(0)
+
+    def test_put_on_full_queue(self):
+        """Test that putting into a full queue raises Full."""
+        queue = SPSCQueue(1)
+        queue.put(1)
+        self.assertTrue(queue.full())
+        with self.assertRaises(Full):
+            queue.put_nowait(2)
+        with self.assertRaises(Full):
+            queue.put(2, timeout=0.01)
+
+    def test_get_on_empty_queue(self):
+        """Test that getting from an empty queue raises Empty."""
+        queue = SPSCQueue(1)
+        with self.assertRaises(Empty):
+            queue.get_nowait()
+        with self.assertRaises(Empty):
+            queue.get(timeout=0.01)
+
+    def test_blocked_get_is_woken_by_put(self):
+        """Test that a consumer waiting on an empty queue receives a later item."""
+        queue = SPSCQueue(1)
+        timer = threading.Timer(0.05, queue.put, args=("message",))
+        timer.start()
+        self.assertEqual(queue.get(timeout=5), "message")
+        timer.join()
+
+    def test_producer_consumer_threads(self):
+        """Test that all items are handed over in order between two threads."""
+        queue = SPSCQueue(4)
+        count = 10000
+        received = []
+
+        def consume():
+            for _ in range(count):
+                received.append(queue.get(timeout=5))
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for item in range(count):
+            queue.put(item, timeout=5)
+        consumer.join()
+        self.assertEqual(received, list(range(count)))
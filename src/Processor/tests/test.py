@@ -3,7 +3,7 @@
  * @brief Test suite for unit tests of Processor.
  *
  * This file contains a test suite that aggregates unit tests from multiple modules.
- * The test suite includes tests for the Arguments class, FeatureExtraction class, and Evaluator class.
+ * The test suite includes tests for the Arguments class, FeatureExtraction class, Evaluator class, SPSCQueue class, and MongoDbDatabase class.
  *
  * Main functionalities of this file include:
  * - Constructing a test suite containing all test cases from various modules.
@@ -19,8 +19,10 @@
 import unittest
 
 import arguments_tests
+import database_tests
 import evaluator_tests
 import feature_extraction_tests
+import spsc_queue_tests
 
 
 def suite() -> unittest.TestSuite:
@@ -37,6 +39,8 @@ def suite() -> unittest.TestSuite:
     suite.addTests(loader.loadTestsFromModule(arguments_tests))
     suite.addTests(loader.loadTestsFromModule(feature_extraction_tests))
     suite.addTests(loader.loadTestsFromModule(evaluator_tests))
+    suite.addTests(loader.loadTestsFromModule(spsc_queue_tests))
+    suite.addTests(loader.loadTestsFromModule(database_tests))
     return suite
 
 
@@ -20,13 +20,40 @@
 """
 
 import argparse
+import os
 import random
+import select
 import socket
-from typing import List
+import struct
+import sys
+import time
+from collections import deque
+from typing import Deque, Iterator, List, Tuple, Union
 
 import pandas as pd
 import pyarrow.parquet as pq
 
+DNS_HEADER = bytes.fromhex("00 01 81 80 00 01 00 01 00 00 00 00")
+DNS_HEADER_LENGTH = len(DNS_HEADER)
+DNS_QUESTION_TRAILER = b"\x00" + b"\x00\x01" + b"\x00\x01"  # Root label, Type A, Class IN
+DNS_ANSWER_FIXED = (
+    b"\x00\x01"  # Type A
+    + b"\x00\x01"  # Class IN
+    + b"\x00\x00\x0e\x10"  # TTL (3600 seconds)
+    + b"\x00\x04"  # Data length (4 bytes for IPv4)
+)
+DNS_ANSWER_FIXED_LENGTH = len(DNS_ANSWER_FIXED)
+
+# Linux constants from <linux/socket.h>, not exported by the socket module
+SO_ZEROCOPY = getattr(socket, "SO_ZEROCOPY", 60)
+MSG_ZEROCOPY = getattr(socket, "MSG_ZEROCOPY", 0x4000000)
+# struct sock_extended_err: ee_errno, ee_origin, ee_type, ee_code, ee_pad, ee_info, ee_data
+SOCK_EXTENDED_ERR = struct.Struct("=IBBBBII")
+# Responses sent between time limit checks and zerocopy completion drains
+SEND_CHUNK_SIZE = 1024
+# Milliseconds to wait for the next zerocopy completion after the last send
+ZEROCOPY_DRAIN_TIMEOUT = 100
+
 
 def load_dataset_in_batches(
     dataset_path: str, batch_size: int = 100000
@@ -76,54 +103,183 @@ def generate_dns_response(domain_name: str) -> bytes:
     """
     Generate DNS response for a domain name.
 
+    The response is assembled in a single preallocated buffer from the constant
+    header and answer parts, only the question and the IPv4 address are written per call.
+
     Args:
         domain_name (str): Domain name for which DNS response is generated.
 
     Returns:
         bytes: DNS response.
     """
-    ip_address = ".".join(str(random.randint(0, 255)) for _ in range(4))
-    domain_name_parts = domain_name.split(".")
-    dns_question = b""
-    for part in domain_name_parts:
-        dns_question += len(part).to_bytes(1, "big") + part.encode()
-    dns_question += b"\x00"  # Null byte to end the domain name
-    dns_question += b"\x00\x01" + b"\x00\x01"  # Type A, Class IN for the question part
-
-    dns_header = bytes.fromhex("00 01 81 80 00 01 00 01 00 00 00 00")
-
-    # Answer section
-    dns_answer = (
-        dns_question  # Repeat the domain name instead of using a pointer
-        + b"\x00\x01"
-        + b"\x00\x01"  # Type A, Class IN for the answer part
-        + b"\x00\x00\x0e\x10"  # TTL (3600 seconds)
-        + b"\x00\x04"  # Data length (4 bytes for IPv4)
-        + bytes(map(int, ip_address.split(".")))
-    )
-    dns_response = dns_header + dns_question + dns_answer
-    return dns_response
+    # The name is encoded once and split into labels as bytes, so every length octet matches the encoded label
+    dns_question = bytearray()
+    for label in domain_name.encode().split(b"."):
+        dns_question.append(len(label))
+        dns_question += label
+    dns_question += DNS_QUESTION_TRAILER
+
+    question_length = len(dns_question)
+    answer_offset = DNS_HEADER_LENGTH + question_length
+    ip_offset = answer_offset + question_length + DNS_ANSWER_FIXED_LENGTH
+
+    dns_response = bytearray(ip_offset + 4)
+    dns_response[:DNS_HEADER_LENGTH] = DNS_HEADER
+    dns_response[DNS_HEADER_LENGTH:answer_offset] = dns_question
+    # Answer section repeats the question instead of using a name pointer
+    dns_response[answer_offset : answer_offset + question_length] = dns_question
+    dns_response[answer_offset + question_length : ip_offset] = DNS_ANSWER_FIXED
+    # One 32-bit draw provides all four random octets of the IPv4 address
+    struct.pack_into(">I", dns_response, ip_offset, random.getrandbits(32))
+    return bytes(dns_response)
+
+
+def enable_zerocopy(udp_socket: socket.socket) -> bool:
+    """
+    Enable MSG_ZEROCOPY transmission on the socket if the kernel supports it.
 
+    Args:
+        udp_socket: UDP socket for sending DNS responses.
 
-def send_dns_responses(
-    domain_batches: List[List[str]], udp_socket: socket.socket
+    Returns:
+        bool: True if SO_ZEROCOPY was enabled, False on non-Linux systems or kernels older than 5.0.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        udp_socket.setsockopt(socket.SOL_SOCKET, SO_ZEROCOPY, 1)
+    except OSError:
+        return False
+    return True
+
+
+def drain_zerocopy_completions(
+    udp_socket: socket.socket, in_flight: Deque[Tuple[int, bytes]]
 ) -> None:
     """
-    Send DNS responses for domain names.
+    Read MSG_ZEROCOPY completion notifications and release the buffers they cover.
+
+    The kernel keeps the pages of a zerocopy send pinned until it reports the send
+    as completed, so the responses are referenced in in_flight until then.
 
     Args:
-        domain_batches (list): List of batches, where each batch contains domain names.
-        udp_socket: UDP socket for sending DNS responses.
+        udp_socket: UDP socket with SO_ZEROCOPY enabled.
+        in_flight (deque): Pairs of send sequence number and the buffer that was sent.
 
     Returns:
         None
     """
-    count = 0
+    while True:
+        try:
+            _, ancdata, _, _ = udp_socket.recvmsg(
+                0,
+                socket.CMSG_SPACE(SOCK_EXTENDED_ERR.size),
+                socket.MSG_ERRQUEUE | socket.MSG_DONTWAIT,
+            )
+        except (BlockingIOError, InterruptedError):
+            return
+        for _, _, cmsg_data in ancdata:
+            last_completed = SOCK_EXTENDED_ERR.unpack_from(cmsg_data)[-1]
+            while in_flight and in_flight[0][0] <= last_completed:
+                in_flight.popleft()
+
+
+def pin_to_cpu(cpu: int) -> bool:
+    """
+    Pin the current process to a single CPU core to keep its caches warm.
+
+    Args:
+        cpu (int): Index of the core, wrapped around the number of available cores.
+
+    Returns:
+        bool: True if the process was pinned, False where CPU affinity is not supported.
+    """
+    if not hasattr(os, "sched_setaffinity"):
+        return False
+    os.sched_setaffinity(0, {cpu % os.cpu_count()})
+    return True
+
+
+def iterate_chunks(
+    domain_batches: List[list], chunk_size: int = SEND_CHUNK_SIZE
+) -> Iterator[list]:
+    """
+    Split the loaded batches into chunks of at most chunk_size items.
+
+    Args:
+        domain_batches (list): List of batches, where each batch contains domain names or DNS responses.
+        chunk_size (int): Maximum number of items in a chunk.
+
+    Returns:
+        Iterator[list]: Chunks of domain names or DNS responses.
+    """
     for batch in domain_batches:
-        for domain_name in batch:
-            response = generate_dns_response(domain_name)
-            udp_socket.sendto(response, ("localhost", 53))
-            count += 1
+        for start in range(0, len(batch), chunk_size):
+            yield batch[start : start + chunk_size]
+
+
+def build_dns_responses(domain_batches: List[List[str]]) -> List[List[bytes]]:
+    """
+    Generate the DNS responses for all domain names ahead of sending.
+
+    Args:
+        domain_batches (list): List of batches, where each batch contains domain names.
+
+    Returns:
+        list: List of batches, where each batch contains DNS responses.
+    """
+    return [list(map(generate_dns_response, batch)) for batch in domain_batches]
+
+
+def send_dns_responses(
+    domain_batches: Union[List[List[str]], List[List[bytes]]],
+    udp_socket: socket.socket,
+    zerocopy: bool = False,
+    duration: float = None,
+    prebuilt: bool = False,
+) -> int:
+    """
+    Send DNS responses for domain names.
+
+    The time limit is checked once per chunk of SEND_CHUNK_SIZE responses, not per response.
+    With zerocopy, the remaining completions are drained after the last send, until none
+    arrives within ZEROCOPY_DRAIN_TIMEOUT milliseconds.
+
+    Args:
+        domain_batches (list): List of batches, where each batch contains domain names, or DNS responses if prebuilt.
+        udp_socket: UDP socket connected to the DNS port the responses are sent to.
+        zerocopy (bool): Send with MSG_ZEROCOPY, the socket must have SO_ZEROCOPY enabled.
+        duration (float): Stop sending after this many seconds, None sends the whole dataset.
+        prebuilt (bool): The batches already contain responses from build_dns_responses.
+
+    Returns:
+        int: Number of DNS responses sent.
+    """
+    send = udp_socket.send
+    deadline = None if duration is None else time.monotonic() + duration
+    in_flight: Deque[Tuple[int, bytes]] = deque()
+    count = 0
+    for chunk in iterate_chunks(domain_batches):
+        responses = chunk if prebuilt else map(generate_dns_response, chunk)
+        if zerocopy:
+            for response in responses:
+                send(response, MSG_ZEROCOPY)
+                in_flight.append((count, response))
+                count += 1
+            drain_zerocopy_completions(udp_socket, in_flight)
+        else:
+            # Exhaust the map chain in C instead of a Python-level for loop
+            deque(map(send, responses), maxlen=0)
+            count += len(chunk)
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+    if in_flight:
+        # Completions are reported on the error queue, which poll signals with POLLERR
+        poller = select.poll()
+        poller.register(udp_socket, select.POLLERR)
+        while in_flight and poller.poll(ZEROCOPY_DRAIN_TIMEOUT):
+            drain_zerocopy_completions(udp_socket, in_flight)
+    return count
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -148,34 +304,86 @@ def parse_arguments() -> argparse.Namespace:
         nargs="?",
         help="Batch size for loading the dataset",
     )
+    parser.add_argument(
+        "--zerocopy",
+        action="store_true",
+        help="Send with MSG_ZEROCOPY when supported (Linux 5.0+)",
+    )
+    parser.add_argument(
+        "--cpu",
+        type=int,
+        default=None,
+        help="Pin the sender to this CPU core (Linux only)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="Stop sending after this many seconds",
+    )
+    parser.add_argument(
+        "--prebuild",
+        action="store_true",
+        help="Generate all DNS responses before sending, so the timed loop only sends",
+    )
     return parser.parse_args()
 
 
-def main(dataset_path: str, batch_size: int) -> None:
+def main(
+    dataset_path: str,
+    batch_size: int,
+    zerocopy: bool = False,
+    cpu: int = None,
+    duration: float = None,
+    prebuild: bool = False,
+) -> None:
     """
     Main function to send DNS responses for domain names from a dataset.
 
     Args:
         dataset_path (str): Path to the Parquet dataset file.
         batch_size (int): Batch size for loading the dataset.
+        zerocopy (bool): Try to send with MSG_ZEROCOPY, falls back to regular sends if unsupported.
+        cpu (int): CPU core to pin the sender to, None leaves scheduling to the OS.
+        duration (float): Stop sending after this many seconds, None sends the whole dataset.
+        prebuild (bool): Generate all DNS responses before the timed send loop.
 
     Returns:
         None
     """
+    if cpu is not None and not pin_to_cpu(cpu):
+        print("CPU pinning is not supported on this platform.")
     udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    udp_socket.bind(("localhost", 53))
+    # Bound to the port it sends to, so the datagrams land in its own receive queue instead of
+    # drawing ICMP port unreachable replies that make the next send() on the connected socket fail
+    udp_socket.bind(("127.0.0.1", 53))
+    udp_socket.connect(("127.0.0.1", 53))
+    if zerocopy and not enable_zerocopy(udp_socket):
+        print("MSG_ZEROCOPY is not supported, using regular sends.")
+        zerocopy = False
     domain_batches = load_dataset_in_batches(dataset_path, batch_size)
-    send_dns_responses(domain_batches, udp_socket)
+    if prebuild:
+        domain_batches = build_dns_responses(domain_batches)
+    start_time = time.perf_counter()
+    count = send_dns_responses(
+        domain_batches, udp_socket, zerocopy, duration, prebuild
+    )
+    elapsed_time = time.perf_counter() - start_time
     udp_socket.close()
+    if elapsed_time > 0:
+        print(
+            f"Sent {count} DNS responses in {elapsed_time:.2f} s "
+            f"({count / elapsed_time:.0f} responses/s)"
+        )
 
 
 if __name__ == "__main__":
     args = parse_arguments()
-    main(args.dataset_path, args.batch_size)
-
-
-
-
-
-
-
+    main(
+        args.dataset_path,
+        args.batch_size,
+        args.zerocopy,
+        args.cpu,
+        args.duration,
+        args.prebuild,
+    )